@@ -0,0 +1,194 @@
+"""SQLite archive of every evaluated search candidate.
+
+A search run used to leave nothing behind but ``output/<name>_top<i>.json``.
+Now :mod:`search` appends every complete evaluation to ``output/archive.sqlite``:
+the parameter vector, the objective ``L`` and its terms, the snap residual, the
+snapped seeds and the evaluation time.  With that,
+
+* a new run can warm-start CMA-ES from the best archived point
+  (``search.py --warm-start``);
+* exact repeats are never re-evaluated: the run's objective cache is preloaded
+  with the archived rows of the same context (seed file contents, engine,
+  jitter, weights) and cache quantum;
+* configs can be queried without re-packing anything::
+
+    python archive.py --min-eyes 12 --max-gap-jump 3.0
+    python archive.py --file irregular_frame.json --limit 5 --json
+
+  ``L`` is only comparable within a context, so a query sees each seed
+  file's most recent context unless given ``--context`` (a hash prefix, as
+  printed) or ``--all-contexts``.
+
+Rows are unique on ``(context, quantum, key)`` - ``key`` being the quantized
+parameter vector of :class:`search.ObjectiveCache` - and indexed by objective
+(``context, L``) and by the two terms most worth filtering on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+ARCHIVE_PATH = _HERE / "output" / "archive.sqlite"
+ARCHIVE_QUANTUM = 1e-6      # key lattice (mm) for runs with the objective cache off
+
+# analyse() terms stored as their own columns (``gens`` is not kept).
+TERMS = ("n_circles", "n_eye_band", "logr_spread", "eye_spatial_spread",
+         "r_min", "r_max", "n_gaps", "gap_jump", "gap_jump_max")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    context TEXT NOT NULL,
+    quantum REAL NOT NULL,
+    key TEXT NOT NULL,
+    seed_file TEXT NOT NULL,
+    run_seed INTEGER,
+    seed INTEGER NOT NULL,
+    x TEXT NOT NULL,
+    L REAL NOT NULL,
+    {", ".join(f"{t} {'INTEGER' if t.startswith('n_') else 'REAL'}" for t in TERMS)},
+    residual REAL,
+    seconds REAL,
+    circles TEXT,
+    created REAL,
+    UNIQUE (context, quantum, key)
+);
+CREATE INDEX IF NOT EXISTS by_objective ON evaluations (context, L);
+CREATE INDEX IF NOT EXISTS by_terms ON evaluations (n_eye_band, gap_jump);
+"""
+
+
+class Archive:
+    """One archive database; rows go in through :meth:`add`."""
+
+    def __init__(self, path: str | Path = ARCHIVE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(_SCHEMA)
+        self.added = 0
+
+    def close(self) -> None:
+        self.db.close()
+
+    def add(self, context: str, quantum: float, seed_file: str, run_seed: int,
+            rows) -> int:
+        """Insert ``(key, evaluation)`` pairs; rows already archived are
+        skipped.  Returns how many were new."""
+        now = time.time()
+        cur = self.db.executemany(
+            f"INSERT OR IGNORE INTO evaluations (context, quantum, key, seed_file, "
+            f"run_seed, seed, x, L, {', '.join(TERMS)}, residual, seconds, circles, "
+            f"created) VALUES ({', '.join('?' * (len(TERMS) + 12))})",
+            [(context, quantum, _key(key), seed_file, run_seed, ev.seed,
+              json.dumps([float(v) for v in ev.x]), ev.L,
+              *(ev.terms.get(t) for t in TERMS), ev.residual, ev.seconds,
+              json.dumps([[c.z.real, c.z.imag, c.r] for c in ev.circles]), now)
+             for key, ev in rows])
+        self.db.commit()
+        self.added += cur.rowcount
+        return cur.rowcount
+
+    def load(self, context: str, quantum: float, *, limit: int) -> list[dict]:
+        """The ``limit`` most recent rows for a context, oldest first."""
+        rows = self.db.execute(
+            "SELECT * FROM evaluations WHERE context = ? AND quantum = ? "
+            "ORDER BY id DESC LIMIT ?", (context, quantum, limit)).fetchall()
+        return [_row(r) for r in reversed(rows)]
+
+    def best(self, context: str, *, limit: int = 1) -> list[dict]:
+        """The ``limit`` lowest-``L`` rows for a context (any quantum)."""
+        rows = self.db.execute(
+            "SELECT * FROM evaluations WHERE context = ? ORDER BY L LIMIT ?",
+            (context, limit)).fetchall()
+        return [_row(r) for r in rows]
+
+    def query(self, *, seed_file: str | None = None, context: str | None = None,
+              latest: bool = True, min_eyes: int | None = None,
+              max_gap_jump: float | None = None, max_L: float | None = None,
+              limit: int = 20) -> list[dict]:
+        """Rows matching every given filter, best ``L`` first.
+
+        ``context`` matches a context hash prefix; without one, ``latest``
+        keeps each seed file's most recently archived context only."""
+        where, args = [], []
+        if context is None and latest:
+            where.append("context IN (SELECT context FROM evaluations WHERE id IN "
+                         "(SELECT MAX(id) FROM evaluations GROUP BY seed_file))")
+        for clause, value in (("seed_file = ?", seed_file),
+                              ("context LIKE ?", None if context is None else f"{context}%"),
+                              ("n_eye_band >= ?", min_eyes),
+                              ("gap_jump <= ?", max_gap_jump),
+                              ("L <= ?", max_L)):
+            if value is not None:
+                where.append(clause)
+                args.append(value)
+        sql = "SELECT * FROM evaluations"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self.db.execute(sql + " ORDER BY L LIMIT ?", (*args, limit)).fetchall()
+        return [_row(r) for r in rows]
+
+
+def _key(key: tuple) -> str:
+    return ",".join(map(str, key))
+
+
+def _row(r: sqlite3.Row) -> dict:
+    d = dict(r)
+    d["key"] = tuple(int(v) for v in d["key"].split(","))
+    d["x"] = json.loads(d["x"])
+    d["circles"] = json.loads(d["circles"] or "[]")
+    terms = {t: d.pop(t) for t in TERMS}
+    d["terms"] = {t: v for t, v in terms.items() if v is not None}
+    return d
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(prog=argv[0], description=__doc__.split("\n")[0])
+    ap.add_argument("path", nargs="?", type=Path, default=ARCHIVE_PATH)
+    ap.add_argument("--file", default=None, help="seed file name, e.g. irregular_frame.json")
+    ap.add_argument("--context", default=None,
+                    help="context hash prefix (default: each file's latest context)")
+    ap.add_argument("--all-contexts", action="store_true",
+                    help="mix every context (L is not comparable across them)")
+    ap.add_argument("--min-eyes", type=int, default=None, help="n_eye_band at least")
+    ap.add_argument("--max-gap-jump", type=float, default=None, help="gap_jump at most")
+    ap.add_argument("--max-L", type=float, default=None)
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--json", action="store_true", help="print rows as JSON lines")
+    a = ap.parse_args(argv[1:])
+    if not a.path.exists():
+        raise SystemExit(f"{a.path}: no archive yet - run search.py first")
+
+    archive = Archive(a.path)
+    rows = archive.query(seed_file=a.file, context=a.context,
+                         latest=not a.all_contexts, min_eyes=a.min_eyes,
+                         max_gap_jump=a.max_gap_jump, max_L=a.max_L, limit=a.limit)
+    total = archive.db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+    archive.close()
+    if a.json:
+        for r in rows:
+            print(json.dumps({k: v for k, v in r.items() if k != "key"}))
+        return
+    print(f"{len(rows)} of {total} archived evaluations")
+    print(f"{'L':>9s} {'eyes':>5s} {'gap_jump':>9s} {'logr_spread':>11s} "
+          f"{'resid':>8s} {'ms':>6s} {'context':8s}  file / x")
+    for r in rows:
+        t = r["terms"]
+        print(f"{r['L']:9.4f} {t.get('n_eye_band', 0):5.0f} "
+              f"{t.get('gap_jump', float('nan')):9.4f} "
+              f"{t.get('logr_spread', float('nan')):11.4f} {r['residual']:8.1e} "
+              f"{1e3 * r['seconds']:6.1f} {r['context'][:8]}  {r['seed_file']} "
+              + " ".join(f"{v:.2f}" for v in r["x"]))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,428 @@
+"""Array-backed Apollonian packing: one vectorized reflection per generation.
+
+:func:`packing.pack` walks the gap tree one :class:`~geometry.Circle` at a time,
+so deep packings spend their time in Python call overhead.  Here the whole
+active frontier of gaps lives in NumPy arrays - curvatures ``K`` and
+curvature-centres ``W`` of shape ``(n, 4)``, columns ``(c1, c2, c3, known)`` -
+and the sign-free Descartes reflection runs for an entire generation at once::
+
+    k4 = 2 (k1 + k2 + k3) - k_known        w4 = 2 (w1 + w2 + w3) - w_known
+
+The children are then filtered on ``r_min`` / the clip rect / ``max_depth``,
+deduplicated (same ``DEDUP_TOL`` rule as :func:`packing.pack`, via a KD-tree
+instead of per-circle bucket scans) and each survivor spawns its three
+sub-gaps for the next generation.
+
+Results come back as a :class:`CircleArrays` structure-of-arrays container;
+``to_circles()`` converts to the ``list[Circle]`` the renderer consumes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from geometry import Circle, descartes_pair
+from packing import DEDUP_TOL, SEED_TANGENT_TOL, PackStats, Rect, tangent_triples
+
+
+@dataclass
+class CircleArrays:
+    """Structure-of-arrays view of a packing (parallel 1-D arrays)."""
+
+    k: np.ndarray          # float64 signed curvature
+    w: np.ndarray          # complex128, k * z
+    depth: np.ndarray      # int generation (0 for seeds)
+    feature: np.ndarray    # object array of str tags ("" for packed circles)
+
+    @classmethod
+    def empty(cls) -> "CircleArrays":
+        return cls(k=np.zeros(0), w=np.zeros(0, complex),
+                   depth=np.zeros(0, int), feature=np.zeros(0, object))
+
+    @classmethod
+    def from_circles(cls, circles: list[Circle]) -> "CircleArrays":
+        if not circles:
+            return cls.empty()
+        return cls(k=np.array([c.k for c in circles], float),
+                   w=np.array([c.w for c in circles], complex),
+                   depth=np.array([c.depth for c in circles], int),
+                   feature=np.array([c.feature for c in circles], object))
+
+    def to_circles(self) -> list[Circle]:
+        return [Circle(k=float(k), w=complex(w), depth=int(d), feature=str(f))
+                for k, w, d, f in zip(self.k, self.w, self.depth, self.feature)]
+
+    def select(self, mask) -> "CircleArrays":
+        return CircleArrays(k=self.k[mask], w=self.w[mask],
+                            depth=self.depth[mask], feature=self.feature[mask])
+
+    @staticmethod
+    def concat(parts: list["CircleArrays"]) -> "CircleArrays":
+        if not parts:
+            return CircleArrays.empty()
+        return CircleArrays(k=np.concatenate([p.k for p in parts]),
+                            w=np.concatenate([p.w for p in parts]),
+                            depth=np.concatenate([p.depth for p in parts]),
+                            feature=np.concatenate([p.feature for p in parts]))
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.w / self.k
+
+    @property
+    def r(self) -> np.ndarray:
+        return np.abs(1.0 / self.k)
+
+    def __len__(self) -> int:
+        return len(self.k)
+
+
+# --------------------------------------------------------------------------- #
+# Vectorized clip tests (array twins of Rect.contains_disk / packing._touches)
+# --------------------------------------------------------------------------- #
+def contains_disks(clip: Rect, z: np.ndarray, r: np.ndarray,
+                   slack: float = 0.0) -> np.ndarray:
+    return ((z.real - r >= clip.x0 - slack) & (z.real + r <= clip.x1 + slack)
+            & (z.imag - r >= clip.y0 - slack) & (z.imag + r <= clip.y1 + slack))
+
+
+def touches_disks(clip: Rect, z: np.ndarray, r: np.ndarray) -> np.ndarray:
+    nx = np.clip(z.real, clip.x0, clip.x1)
+    ny = np.clip(z.imag, clip.y0, clip.y1)
+    return np.abs((nx + 1j * ny) - z) <= r
+
+
+def _xy(z: np.ndarray) -> np.ndarray:
+    return np.column_stack((z.real, z.imag))
+
+
+def _fresh(z: np.ndarray, seen: cKDTree | None) -> np.ndarray:
+    """Mask of entries in ``z`` not within ``DEDUP_TOL`` of ``seen`` nor of an
+    earlier entry of ``z`` itself (first occurrence wins, as in ``pack``)."""
+    keep = np.ones(len(z), bool)
+    if not len(z):
+        return keep
+    if seen is not None and seen.n:
+        d, _ = seen.query(_xy(z), distance_upper_bound=DEDUP_TOL)
+        keep &= ~(d < DEDUP_TOL)
+    pairs = cKDTree(_xy(z)).query_pairs(DEDUP_TOL, output_type="ndarray")
+    if len(pairs):
+        keep[pairs.max(axis=1)] = False
+    return keep
+
+
+def _sub_gaps(K: np.ndarray, W: np.ndarray, k4: np.ndarray, w4: np.ndarray):
+    """The three gaps around each new circle: ``(c1,c2,ch | c3)``,
+    ``(c1,c3,ch | c2)``, ``(c2,c3,ch | c1)`` - same order as ``pack``.
+
+    Works on ``(n, 4)`` frontiers and on ``(P, n, 4)`` population frontiers.
+    """
+    cols = ((0, 1, 2), (0, 2, 1), (1, 2, 0))
+    Kn = np.concatenate([np.stack((K[..., a], K[..., b], k4, K[..., o]), axis=-1)
+                         for a, b, o in cols], axis=-2)
+    Wn = np.concatenate([np.stack((W[..., a], W[..., b], w4, W[..., o]), axis=-1)
+                         for a, b, o in cols], axis=-2)
+    return Kn, Wn
+
+
+def pack_arrays(seeds: list[Circle], outer: Circle, clip: Rect, *,
+                r_min: float = 1.5, max_depth: int = 40,
+                stats: PackStats | None = None) -> CircleArrays:
+    """Array-engine twin of :func:`packing.pack` (same arguments, same circles).
+
+    Emission order differs (seeds, then generation by generation) but the set
+    of emitted circles matches ``pack`` up to floating-point drift.  ``stats``
+    is filled in a generation at a time.
+    """
+    return CircleArrays.concat(list(pack_generations(
+        seeds, outer, clip, r_min=r_min, max_depth=max_depth, stats=stats)))
+
+
+def pack_generations(seeds: list[Circle], outer: Circle, clip: Rect, *,
+                     r_min: float = 1.5, max_depth: int = 40,
+                     stats: PackStats | None = None) -> Iterator[CircleArrays]:
+    """:func:`pack_arrays` one generation at a time.
+
+    The first item holds the interior seeds and the circles seeded from their
+    tangent triples; then one (possibly empty) item per generation, down to
+    ``max_depth``.  A consumer can stop after any generation and still have a
+    coarser but complete-looking packing.
+    """
+    emitted: list[CircleArrays] = []
+    seen_z: list[np.ndarray] = []
+    total = 0
+    if stats is not None:
+        stats.start()
+
+    # Interior seeds first, so their feature tags survive dedup.
+    interior = [s for s in seeds if s.k > 0 and clip.contains_disk(s)]
+    if interior:
+        emitted.append(CircleArrays.from_circles(interior))
+        seen_z.append(emitted[0].z)
+
+    # Seeding is a short scalar prelude (a handful of triples).
+    rows_k, rows_w = [], []
+    for a, b, c in tangent_triples([outer, *seeds]):
+        if stats is not None:
+            stats.enter(1)
+        inner, _ = descartes_pair(a, b, c)
+        if inner.k <= 0:
+            continue
+        inner = Circle(k=inner.k, w=inner.w, depth=1)
+        prior = np.concatenate(seen_z) if seen_z else np.zeros(0, complex)
+        if not np.any(np.abs(prior - inner.z) < DEDUP_TOL):
+            seen_z.append(np.array([inner.z]))
+            if inner.r >= r_min and clip.contains_disk(inner):
+                emitted.append(CircleArrays.from_circles([inner]))
+        elif stats is not None:
+            stats.dedup_hits += 1
+        for g in ((a, b, inner, c), (a, c, inner, b), (b, c, inner, a),
+                  (a, b, c, inner)):
+            rows_k.append([x.k for x in g])
+            rows_w.append([x.w for x in g])
+
+    first = CircleArrays.concat(emitted)
+    total += len(first)
+    yield first
+
+    K = np.array(rows_k, float).reshape(-1, 4)
+    W = np.array(rows_w, complex).reshape(-1, 4)
+    depth = 2
+    while len(K) and depth <= max_depth:
+        if stats is not None:
+            stats.enter(depth)
+            stats.gaps += len(K) - 1
+            stats.gen_gaps[depth] += len(K) - 1
+        k4 = 2.0 * K[:, :3].sum(axis=1) - K[:, 3]
+        w4 = 2.0 * W[:, :3].sum(axis=1) - W[:, 3]
+
+        ok = k4 > 0
+        K, W, k4, w4 = K[ok], W[ok], k4[ok], w4[ok]
+        z4, r4 = w4 / k4, 1.0 / k4
+        big = r4 >= r_min
+        ok = big & touches_disks(clip, z4, r4)
+        if stats is not None:
+            stats.rejected_r_min += int((~big).sum())
+            stats.rejected_clip += int(big.sum() - ok.sum())
+        K, W, k4, w4, z4, r4 = K[ok], W[ok], k4[ok], w4[ok], z4[ok], r4[ok]
+
+        seen = cKDTree(_xy(np.concatenate(seen_z))) if seen_z else None
+        ok = _fresh(z4, seen)
+        if stats is not None:
+            stats.dedup_hits += int(len(ok) - ok.sum())
+        K, W, k4, w4, z4, r4 = K[ok], W[ok], k4[ok], w4[ok], z4[ok], r4[ok]
+        seen_z.append(z4)
+
+        inside = contains_disks(clip, z4, r4)
+        n = int(inside.sum())
+        total += n
+        K, W = _sub_gaps(K, W, k4, w4)
+        yield CircleArrays(k=k4[inside], w=w4[inside], depth=np.full(n, depth),
+                           feature=np.full(n, "", object))
+        depth += 1
+
+    if stats is not None:
+        stats.depth_cutoffs += len(K)
+        stats.stop(total)
+
+
+# --------------------------------------------------------------------------- #
+# Population-batched shallow packing (search objective)
+# --------------------------------------------------------------------------- #
+@dataclass
+class PopulationArrays:
+    """A shallow packing for every candidate of a population, slot-aligned.
+
+    All candidates share one seed topology, so the gap tree has the same shape
+    for each: slot ``j`` is the same tree node in every candidate and carries
+    one ``depth`` / ``feature``.  ``valid[p, j]`` says whether candidate ``p``
+    actually emits that circle (positive, >= ``r_min``, fully inside the clip).
+    """
+
+    k: np.ndarray          # (P, N) float64
+    w: np.ndarray          # (P, N) complex128
+    valid: np.ndarray      # (P, N) bool
+    depth: np.ndarray      # (N,) int
+    feature: np.ndarray    # (N,) object
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.w / np.where(self.k == 0, np.inf, self.k)
+
+    @property
+    def r(self) -> np.ndarray:
+        return np.abs(1.0 / np.where(self.k == 0, np.inf, self.k))
+
+    def __len__(self) -> int:
+        return self.k.shape[0]
+
+    def candidate(self, p: int) -> CircleArrays:
+        m = self.valid[p]
+        return CircleArrays(k=self.k[p, m], w=self.w[p, m],
+                            depth=self.depth[m], feature=self.feature[m])
+
+
+def tangency_triangles(tangencies, ids: list[str]) -> np.ndarray:
+    """``(T, 3)`` member indices of every triangle in a declared tangency graph.
+
+    Members are ``["outer", *ids]`` (index 0 is the boundary), matching the
+    column order :func:`pack_population` expects.
+    """
+    index = {name: i for i, name in enumerate(["outer", *ids])}
+    adj = {i: set() for i in index.values()}
+    for a, b in tangencies:
+        adj[index[a]].add(index[b])
+        adj[index[b]].add(index[a])
+    tris = [(i, j, m) for i in adj for j in adj[i] if j > i
+            for m in adj[i] & adj[j] if m > j]
+    return np.array(sorted(tris), int).reshape(-1, 3)
+
+
+def _soddy_pair(K: np.ndarray, W: np.ndarray):
+    """Both Soddy circles of each mutually tangent triple, vectorized.
+
+    ``K, W`` have shape ``(..., 3)``.  Returns ``(k_plus, w_plus, k_minus,
+    w_minus)``; the w-root sign is paired with the k-root sign by picking the
+    candidate whose centre sits at tangency distance from the first circle
+    (the array form of :func:`geometry.descartes_pair`'s consistency test).
+    """
+    k1, k2, k3 = K[..., 0], K[..., 1], K[..., 2]
+    w1, w2, w3 = W[..., 0], W[..., 1], W[..., 2]
+    ksum = k1 + k2 + k3
+    kroot = 2.0 * np.sqrt(np.maximum(k1 * k2 + k2 * k3 + k3 * k1, 0.0))
+    wsum = w1 + w2 + w3
+    wroot = 2.0 * np.sqrt(w1 * w2 + w2 * w3 + w3 * w1 + 0j)
+    kp, km = ksum + kroot, ksum - kroot
+
+    def err(k, w):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d = np.abs(w / k - w1 / k1)
+            r, r1 = np.abs(1 / k), np.abs(1 / k1)
+            e = np.minimum(np.abs(d - (r + r1)), np.abs(d - np.abs(r - r1)))
+        return np.where(np.isfinite(e), e, np.inf)
+
+    flip = err(kp, wsum - wroot) < err(kp, wsum + wroot)
+    s = np.where(flip, -1.0, 1.0)
+    return kp, wsum + s * wroot, km, wsum - s * wroot
+
+
+def pack_population(outer: Circle, Z: np.ndarray, R: np.ndarray,
+                    triples: np.ndarray, clip: Rect, *, max_gen: int,
+                    r_min: float = 0.0, features=None) -> PopulationArrays:
+    """Shallow packing of a whole population in one set of array operations.
+
+    ``Z`` / ``R`` are ``(P, n)`` seed centres and radii (one row per candidate,
+    already snapped), ``triples`` the ``(T, 3)`` seed-triangle member indices
+    from :func:`tangency_triangles`.  Packs generations ``1..max_gen``.
+
+    The frontier is never compacted: gaps carry a ``(P, G)`` validity mask and
+    every generation is one reflection over ``(P, G, 4)`` arrays, so there is
+    no per-candidate Python loop.  Generation 1 is the Soddy circles of the
+    seed triangles' free sides (a side already filled by a seed is skipped);
+    from there it is a tree, so no dedup is needed.
+    """
+    P, n = Z.shape
+    Km = np.concatenate([np.full((P, 1), outer.k), 1.0 / R], axis=1)
+    Wm = np.concatenate([np.full((P, 1), outer.w), Z / R], axis=1)
+    Zm = Wm / Km
+
+    Kt, Wt = Km[:, triples], Wm[:, triples]                 # (P, T, 3)
+    kp, wp, km, wm = _soddy_pair(Kt, Wt)
+
+    def is_member(k, w):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = w / k
+        same = (np.abs(z[..., None] - Zm[:, None, :]) < SEED_TANGENT_TOL) \
+            & (np.abs(k[..., None] - Km[:, None, :])
+               < 1e-3 * np.abs(Km[:, None, :]))
+        return same.any(axis=-1)
+
+    # One gap per free side: (a, b, c | the opposite Soddy circle).
+    K = np.concatenate([np.concatenate([Kt, km[..., None]], -1),
+                        np.concatenate([Kt, kp[..., None]], -1)], axis=1)
+    W = np.concatenate([np.concatenate([Wt, wm[..., None]], -1),
+                        np.concatenate([Wt, wp[..., None]], -1)], axis=1)
+    live = np.concatenate([~is_member(kp, wp), ~is_member(km, wm)], axis=1)
+
+    seeds_in = contains_disks(clip, Z, R)
+    ks, ws, oks, depths = [1.0 / R], [Z / R], [seeds_in], [np.zeros(n, int)]
+    for gen in range(1, max_gen + 1):
+        k4 = 2.0 * K[..., :3].sum(axis=-1) - K[..., 3]
+        w4 = 2.0 * W[..., :3].sum(axis=-1) - W[..., 3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r4 = np.where(k4 > 0, 1.0 / k4, 0.0)
+            z4 = np.where(k4 > 0, w4 / k4, 0j)
+        live = live & (k4 > 0) & (r4 >= r_min) & touches_disks(clip, z4, r4)
+        ks.append(k4)
+        ws.append(w4)
+        oks.append(live & contains_disks(clip, z4, r4))
+        depths.append(np.full(k4.shape[1], gen))
+        K, W = _sub_gaps(K, W, k4, w4)
+        live = np.tile(live, 3)
+
+    if features is None:
+        features = [""] * n
+    feat = np.concatenate([np.array(features, object),
+                           np.full(sum(len(d) for d in depths[1:]), "", object)])
+    return PopulationArrays(k=np.concatenate(ks, 1), w=np.concatenate(ws, 1),
+                            valid=np.concatenate(oks, 1),
+                            depth=np.concatenate(depths), feature=feat)
+
+
+if __name__ == "__main__":
+    # Cross-check against the scalar recursion on the bundled seed config.
+    from config import load
+    from packing import pack
+    from snap import snap
+
+    cfg = load("seeds/irregular_frame.json")
+    seeds = snap(cfg)
+    outer = cfg.outer_circle()
+    for r_min in (1.5, 0.5):
+        ref = pack(seeds, outer, cfg.clip, r_min=r_min)
+        arr = pack_arrays(seeds, outer, cfg.clip, r_min=r_min)
+        print(f"r_min={r_min}: pack -> {len(ref)}, pack_arrays -> {len(arr)}")
+        assert len(ref) == len(arr), "circle counts differ"
+        ref_z = np.array([c.z for c in ref])
+        d, _ = cKDTree(_xy(ref_z)).query(_xy(arr.z))
+        assert np.all(d < DEDUP_TOL), "pack_arrays emitted a circle pack() did not"
+        assert sorted(c.feature for c in ref) == sorted(arr.feature)
+    print("ARRAY PACKING MATCHES pack()")
+
+    # Population batch: jittered + snapped candidates vs the per-candidate
+    # canonical (Möbius) packing.  pack() is not the reference here: with snap
+    # residuals of a few um the reflected third seed can land just past
+    # DEDUP_TOL from itself, and pack() then duplicates it.
+    from dataclasses import replace
+
+    from canonical import pack_canonical
+    from diagnostics import analyse, analyse_population
+
+    rng = np.random.default_rng(1)
+    max_gen = int(cfg.search.get("max_gen_in_objective", 4))
+    pop = []
+    for _ in range(8):
+        moved = [replace(s, z=s.z + complex(*rng.normal(0, 2, 2)),
+                         r=s.r * rng.uniform(0.9, 1.1)) for s in cfg.seeds]
+        pop.append(snap(replace(cfg, seeds=moved)))
+    Z = np.array([[c.z for c in cand] for cand in pop])
+    R = np.array([[c.r for c in cand] for cand in pop])
+    tris = tangency_triangles(cfg.tangencies, [s.id for s in cfg.seeds])
+    batch = pack_population(outer, Z, R, tris, cfg.clip, max_gen=max_gen,
+                            r_min=cfg.r_min, features=[s.feature for s in cfg.seeds])
+    terms = analyse_population(cfg, batch)
+    for p, cand in enumerate(pop):
+        ref = pack_canonical(cand, outer, cfg.clip, r_min=cfg.r_min,
+                             max_depth=max_gen)
+        got = batch.candidate(p)
+        assert len(got) == len(ref), (p, len(got), len(ref))
+        assert sorted(got.depth.tolist()) == sorted(ref.depth.tolist())
+        one = analyse(cfg, ref.to_circles())
+        for key in ("n_circles", "n_eye_band", "logr_spread", "eye_spatial_spread"):
+            assert np.isclose(terms[key][p], one[key], rtol=1e-3), (key, p)
+    print(f"pack_population: {len(pop)} candidates x {batch.k.shape[1]} slots "
+          "match pack_canonical() + analyse()")
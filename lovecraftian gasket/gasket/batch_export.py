@@ -0,0 +1,203 @@
+"""Headless batch export: seed files x shading modes x palettes -> SVG.
+
+    python batch_export.py                                  # every seed, every mode
+    python batch_export.py seeds/irregular_frame.json --modes hatch ringed \\
+        --palettes none "Iris Purple 49:Mauve 80" --workers 4 --set r_min=1.5
+
+Runs :class:`sketch_gasket.GasketSketch` the way ``vsk save`` does - params
+set on the class, ``draw()`` then ``finalize()``, ``Vsketch.save()`` - with no
+GUI, one job per combination on a process pool, writing
+``output/batch/<seed>_<mode>_<palette>.svg``.
+
+Every seed file is snapped and packed once, up front (one pool task per file),
+into :mod:`pack_cache`'s ``.npz`` store; each style job then reads that
+packing instead of packing again, so a variant costs only its rendering.  A
+per-job timing table (packing read, ``draw()``, ``finalize()`` + save) is
+printed at the end.
+
+A palette is ``LINE[:SHADE]`` - pen names from ``pens/*.toml`` for the
+sketch's ``line_color`` / ``shade_color``; ``none`` is black, and a missing
+``SHADE`` follows ``LINE`` as in the sketch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+
+import vsketch
+
+from pack_cache import packed
+from sketch_gasket import COLOR_CHOICES, GasketSketch
+from style import SHADING_MODES
+
+_HERE = Path(__file__).resolve().parent
+SEEDS_DIR = _HERE / "seeds"
+OUT_DIR = _HERE / "output" / "batch"
+
+# Sketch params a batch job always overrides: one job renders on one core,
+# and previews / budgets would export a partial packing.
+HEADLESS = {"render_workers": 0, "progressive": False, "max_circles": 0,
+            "max_seconds": 0.0}
+
+
+@dataclass(frozen=True)
+class Job:
+    seed_file: str              # a file name in seeds/ (the sketch's seed_file)
+    shading_mode: str
+    palette: str
+
+    @property
+    def name(self) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.palette).strip("-").lower()
+        return f"{Path(self.seed_file).stem}_{self.shading_mode}_{slug}"
+
+
+def parse_palette(spec: str) -> tuple[str, str]:
+    """``"LINE[:SHADE]"`` -> ``(line_color, shade_color)`` sketch params."""
+    line, _, shade = spec.partition(":")
+    line, shade = line.strip() or "none", shade.strip() or "none"
+    for pen in (line, shade):
+        if pen not in COLOR_CHOICES:
+            raise ValueError(f"unknown pen {pen!r} in palette {spec!r} "
+                             f"(pens/*.toml has {len(COLOR_CHOICES) - 1})")
+    return line, shade
+
+
+def _seed_name(path: str | Path) -> str:
+    path = Path(path)
+    if not path.is_absolute() and not path.exists():
+        path = SEEDS_DIR / path
+    if path.resolve().parent != SEEDS_DIR or not path.exists():
+        raise ValueError(f"{path}: the sketch only loads seed files from {SEEDS_DIR}")
+    return path.name
+
+
+# Worker-process state: the sketch params are shipped once per worker.
+_WORKER: dict = {}
+
+
+def _init_worker(params: dict, out_dir: Path) -> None:
+    _WORKER.update(params=params, out_dir=out_dir)
+
+
+def _packing(seed_file: str):
+    p = _WORKER["params"]
+    return packed(SEEDS_DIR / seed_file, r_min=p["r_min"],
+                  max_depth=int(p["max_depth"]), engine=p["engine"])
+
+
+def _pack_job(seed_file: str) -> dict:
+    t0 = time.perf_counter()
+    _, _, circles = _packing(seed_file)
+    return {"seed_file": seed_file, "circles": len(circles),
+            "pack": time.perf_counter() - t0}
+
+
+def _render_job(job: Job) -> dict:
+    t0 = time.perf_counter()
+    _, _, circles = _packing(job.seed_file)         # the .npz the pack job wrote
+    t1 = time.perf_counter()
+    line, shade = parse_palette(job.palette)
+    GasketSketch.set_param_set({**_WORKER["params"], "seed_file": job.seed_file,
+                                "shading_mode": job.shading_mode,
+                                "line_color": line, "shade_color": shade})
+    vsk = vsketch.Vsketch()
+    sketch = GasketSketch()
+    sketch.draw(vsk)
+    t2 = time.perf_counter()
+    sketch.finalize(vsk)
+    out = _WORKER["out_dir"] / f"{job.name}.svg"
+    vsk.save(str(out))
+    t3 = time.perf_counter()
+    return {"job": job, "circles": len(circles), "read": t1 - t0,
+            "draw": t2 - t1, "save": t3 - t2, "path": out}
+
+
+def run(seed_files, *, modes=SHADING_MODES, palettes=("none",),
+        params: dict | None = None, workers: int | None = None,
+        out_dir: Path = OUT_DIR) -> tuple[list[dict], list[dict]]:
+    """Export every combination; returns the pack and render timing rows."""
+    names = list(dict.fromkeys(_seed_name(p) for p in seed_files))
+    for spec in palettes:
+        parse_palette(spec)
+    defaults = {name: p.value for name, p in GasketSketch.get_params().items()}
+    params = {**defaults, **(params or {}), **HEADLESS}
+    jobs = [Job(*combo) for combo in product(names, modes, palettes)]
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(params, out_dir)
+        return list(map(_pack_job, names)), list(map(_render_job, jobs))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(params, out_dir)) as pool:
+        packs = list(pool.map(_pack_job, names))
+        renders = list(pool.map(_render_job, jobs))
+    return packs, renders
+
+
+def report(packs: list[dict], renders: list[dict], wall: float, workers: int) -> None:
+    print(f"{'seed file':24s} {'circles':>7s} {'pack ms':>9s}")
+    for row in packs:
+        print(f"{row['seed_file']:24s} {row['circles']:7d} {1e3 * row['pack']:9.1f}")
+    w = max((len(row["job"].name) for row in renders), default=3)
+    print(f"\n{'job':{w}s} {'circles':>7s} {'read ms':>8s} {'draw ms':>9s} "
+          f"{'save ms':>9s} {'total ms':>9s}")
+    for row in renders:
+        total = row["read"] + row["draw"] + row["save"]
+        print(f"{row['job'].name:{w}s} {row['circles']:7d} {1e3 * row['read']:8.1f} "
+              f"{1e3 * row['draw']:9.1f} {1e3 * row['save']:9.1f} {1e3 * total:9.1f}")
+    busy = sum(r["pack"] for r in packs) \
+        + sum(r["read"] + r["draw"] + r["save"] for r in renders)
+    print(f"\n{len(renders)} SVGs from {len(packs)} packings in {wall:.1f} s on "
+          f"{workers} worker(s) ({busy:.1f} s of job time)")
+
+
+def _param_value(text: str):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text                     # a bare string, e.g. frame_style=rect
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(prog=argv[0], description=__doc__.split("\n")[0])
+    ap.add_argument("seed_files", nargs="*",
+                    default=sorted(p.name for p in SEEDS_DIR.glob("*.json")))
+    ap.add_argument("--modes", nargs="+", choices=SHADING_MODES,
+                    default=list(SHADING_MODES))
+    ap.add_argument("--palettes", nargs="+", default=["none"],
+                    help='"LINE[:SHADE]" pen names ("none" = black)')
+    ap.add_argument("--set", action="append", default=[], metavar="PARAM=VALUE",
+                    help="any other sketch param, e.g. --set r_min=1.5 --set frame_style=rect")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", type=Path, default=OUT_DIR)
+    a = ap.parse_args(argv[1:])
+
+    known = GasketSketch.get_params()
+    params = {}
+    for item in a.set:
+        name, sep, value = item.partition("=")
+        if not sep or name not in known:
+            ap.error(f"--set {item!r}: expected PARAM=VALUE with a GasketSketch param")
+        params[name] = _param_value(value)
+    workers = a.workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    packs, renders = run(a.seed_files, modes=a.modes, palettes=a.palettes,
+                         params=params, workers=workers, out_dir=a.out)
+    report(packs, renders, time.perf_counter() - t0,
+           min(workers, len(renders)))
+    print(f"wrote {a.out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
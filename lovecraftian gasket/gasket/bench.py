@@ -0,0 +1,196 @@
+"""Pipeline benchmark: load -> snap -> pack -> analyse -> render, with scaling fits.
+
+Runs every stage over each seed file (``seeds/*.json`` by default) and, for
+the stages whose cost grows with the packing, over a sweep of ``r_min``.  Each
+stage records its best-of-``--repeat`` wall time, its peak traced memory
+(:mod:`tracemalloc`, measured in a separate untimed pass so tracing does not
+inflate the times) and the circle count.  Per seed file, ``log t`` is fitted
+against ``log n_circles`` across the sweep to give each stage's scaling
+exponent.
+
+The report is JSON with sorted keys and rounded values, so two commits can be
+compared with a plain diff or with ``--compare``::
+
+    python bench.py --out output/bench/before.json
+    python bench.py --out output/bench/after.json --compare output/bench/before.json
+
+Nothing goes through :mod:`pack_cache` - every stage is computed cold; the
+render stage also empties :mod:`features`' template cache on every run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+import features
+from config import load
+from diagnostics import analyse
+from engines import PACK_ENGINES, pack_with
+from render import render_geometries
+from snap import snap
+from style import SHADING_MODES, Style
+
+_HERE = Path(__file__).resolve().parent
+R_MINS = (4.0, 2.0, 1.0, 0.5)          # mm, coarse -> fine
+SWEPT = ("pack", "analyse", "render")  # stages fitted against circle count
+MAX_DEPTH = 40
+
+
+def measure(fn, *, repeat: int = 3) -> tuple[object, dict]:
+    """Run ``fn()``; return its result and ``{"seconds", "peak_kib"}``.
+
+    ``seconds`` is the best of ``repeat`` untraced runs; ``peak_kib`` comes
+    from one extra run under :mod:`tracemalloc`.
+    """
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return out, {"seconds": best, "peak_kib": peak / 1024}
+
+
+def scaling_exponent(n, t) -> float | None:
+    """Least-squares slope of ``log t`` against ``log n`` (``None`` if undefined)."""
+    n, t = np.asarray(n, float), np.asarray(t, float)
+    ok = (n > 0) & (t > 0)
+    if len(np.unique(n[ok])) < 2:
+        return None
+    return float(np.polyfit(np.log(n[ok]), np.log(t[ok]), 1)[0])
+
+
+def _render_cold(circles, style: Style):
+    features._TEMPLATES.clear()
+    return render_geometries(circles, style, seed=0, workers=1)
+
+
+def bench_file(path: Path, *, r_mins=R_MINS, engine: str = "recursive",
+               style: Style | None = None, repeat: int = 3) -> dict:
+    """Benchmark one seed file; returns its section of the report."""
+    style = style or Style()
+    cfg, load_m = measure(lambda: load(path), repeat=repeat)
+    seeds, snap_m = measure(lambda: snap(cfg), repeat=repeat)
+    members = [*seeds, *cfg.edge_lines()]
+    outer = cfg.outer_circle()
+    sweep = []
+    for r_min in r_mins:
+        circles, pack_m = measure(
+            lambda: pack_with(engine, members, outer, cfg.clip, r_min=r_min,
+                              max_depth=MAX_DEPTH), repeat=repeat)
+        _, analyse_m = measure(lambda: analyse(cfg, circles), repeat=repeat)
+        geoms, render_m = measure(lambda: _render_cold(circles, style),
+                                  repeat=repeat)
+        sweep.append({"r_min": r_min, "n_circles": len(circles),
+                      "n_primitives": sum(map(len, geoms)),
+                      "pack": pack_m, "analyse": analyse_m, "render": render_m})
+        print(f"  r_min={r_min:<5g} {len(circles):6d} circles  "
+              + "  ".join(f"{s} {1e3 * sweep[-1][s]['seconds']:8.1f} ms"
+                          for s in SWEPT))
+    n = [row["n_circles"] for row in sweep]
+    return {"load": load_m, "snap": snap_m, "n_seeds": len(seeds),
+            "sweep": sweep,
+            "scaling": {s: scaling_exponent(n, [row[s]["seconds"] for row in sweep])
+                        for s in SWEPT}}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_HERE,
+                              capture_output=True, text=True, check=True
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _rounded(obj, digits: int = 4):
+    """Round floats to ``digits`` significant figures so reports diff cleanly."""
+    if isinstance(obj, float):
+        return float(f"{obj:.{digits}g}")
+    if isinstance(obj, dict):
+        return {k: _rounded(v, digits) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_rounded(v, digits) for v in obj]
+    return obj
+
+
+def run(paths, *, r_mins=R_MINS, engine: str = "recursive",
+        shading_mode: str = "hatch", repeat: int = 3) -> dict:
+    style = Style(shading_mode=shading_mode)
+    report = {"meta": {"commit": _git_commit(), "python": platform.python_version(),
+                       "numpy": np.__version__, "machine": platform.machine(),
+                       "engine": engine, "shading_mode": shading_mode,
+                       "max_depth": MAX_DEPTH, "repeat": repeat,
+                       "r_mins": list(r_mins)},
+              "files": {}}
+    for path in paths:
+        path = Path(path)
+        print(f"{path.name}:")
+        report["files"][path.name] = bench_file(path, r_mins=r_mins, engine=engine,
+                                                style=style, repeat=repeat)
+    return _rounded(report)
+
+
+def compare(report: dict, base: dict) -> None:
+    """Print per-stage time ratios ``report / base`` (< 1 is faster)."""
+    print(f"\n--- vs {base['meta'].get('commit')} (time ratio, <1 = faster) ---")
+    for name, cur in report["files"].items():
+        old = base["files"].get(name)
+        if old is None:
+            continue
+        for stage in ("load", "snap"):
+            print(f"  {name} {stage:8s} {cur[stage]['seconds'] / old[stage]['seconds']:6.2f}x")
+        rows = {row["r_min"]: row for row in old["sweep"]}
+        for row in cur["sweep"]:
+            prev = rows.get(row["r_min"])
+            if prev is None:
+                continue
+            ratios = "  ".join(f"{s} {row[s]['seconds'] / prev[s]['seconds']:5.2f}x"
+                               for s in SWEPT)
+            print(f"  {name} r_min={row['r_min']:<5g} {ratios}"
+                  + ("" if row["n_circles"] == prev["n_circles"] else
+                     f"  (circles {prev['n_circles']} -> {row['n_circles']})"))
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(prog=argv[0], description=__doc__.split("\n")[0])
+    ap.add_argument("paths", nargs="*", type=Path,
+                    default=sorted((_HERE / "seeds").glob("*.json")))
+    ap.add_argument("--r-min", type=float, nargs="+", default=list(R_MINS),
+                    help="r_min sweep in mm")
+    ap.add_argument("--engine", choices=PACK_ENGINES, default="recursive")
+    ap.add_argument("--shading-mode", choices=SHADING_MODES, default="hatch")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", type=Path, default=_HERE / "output" / "bench.json")
+    ap.add_argument("--compare", type=Path, default=None,
+                    help="earlier report to print time ratios against")
+    a = ap.parse_args(argv[1:])
+
+    report = run(a.paths, r_mins=a.r_min, engine=a.engine,
+                 shading_mode=a.shading_mode, repeat=a.repeat)
+    print("\n--- scaling exponents (t ~ n^b) ---")
+    for name, section in report["files"].items():
+        print(f"  {name}: " + "  ".join(f"{s} {b}" for s, b in section["scaling"].items()))
+    a.out.parent.mkdir(parents=True, exist_ok=True)
+    a.out.write_text(json.dumps(report, indent=1, sort_keys=True) + "\n")
+    print(f"wrote {a.out}")
+    if a.compare is not None:
+        compare(report, json.loads(a.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -23,7 +23,11 @@ Schema (see ``seeds/*.json`` for examples)::
                  "r_min": 1.5, "max_gen_in_objective": 4}
     }
 
-``"outer"`` in a tangency pair refers to the boundary circle.
+``"outer"`` in a tangency pair refers to the boundary circle.  The margin
+edges ``"left"``, ``"right"``, ``"top"`` and ``"bottom"`` are straight ``k = 0``
+lines (:meth:`packing.Rect.edge`) that seeds can rest on; a frame bounded by
+one of them instead of a circle uses ``"boundary": {"type": "line", "edge":
+"left"}``.
 """
 
 from __future__ import annotations
@@ -33,7 +37,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from geometry import Circle
-from packing import Rect, a4_clip
+from packing import EDGES, Rect, a4_clip
 
 
 @dataclass
@@ -52,19 +56,41 @@ class Seed:
 @dataclass
 class Config:
     clip: Rect
-    boundary: Seed                 # the enclosing circle (curvature flips on use)
+    boundary: Seed | None          # the enclosing circle (curvature flips on use)
     seeds: list[Seed]
     tangencies: list[tuple[str, str]]
     search: dict = field(default_factory=dict)
     landscape: bool = False
+    boundary_edge: str | None = None   # margin edge bounding the frame instead
 
     # -- convenience views ---------------------------------------------------
     def by_id(self) -> dict[str, Seed]:
         return {s.id: s for s in self.seeds}
 
     def outer_circle(self) -> Circle:
+        """The packing boundary: the enclosing circle, or a margin line."""
+        if self.boundary is None:
+            return self.clip.edge(self.boundary_edge)
         return self.boundary.to_circle(inside=True)
 
+    def edge_lines(self) -> list[Circle]:
+        """Margin lines the tangencies rest seeds on (other than the boundary).
+
+        They are packing members like the seeds: pass ``[*seeds,
+        *cfg.edge_lines()]`` as the ``seeds`` of the packing engines.
+        """
+        used = {ref for pair in self.tangencies for ref in pair}
+        return [self.clip.edge(e) for e in EDGES
+                if e in used and e != self.boundary_edge]
+
+    def contacts(self, circles: list[Circle]) -> dict[str, Circle]:
+        """Every id a tangency can name -> its circle / line, given the
+        (snapped) seed ``circles`` parallel to ``seeds``."""
+        out = {e: self.clip.edge(e) for e in EDGES}
+        out["outer"] = self.outer_circle()
+        out.update((s.id, c) for s, c in zip(self.seeds, circles))
+        return out
+
     def seed_circles(self) -> list[Circle]:
         return [s.to_circle() for s in self.seeds]
 
@@ -91,11 +117,18 @@ def load(path: str | Path) -> Config:
     clip = a4_clip(margin=margin, landscape=landscape)
 
     b = data["boundary"]
-    if b.get("type", "circle") != "circle":
-        raise ValueError("boundary.type must be 'circle' (lines are handled via "
-                         "the margin clip, not Descartes)")
-    boundary = Seed(id="outer", z=_z(b["z"]), r=float(b["r"]),
-                    fixed=True, feature="boundary")
+    kind = b.get("type", "circle")
+    boundary, boundary_edge = None, None
+    if kind == "circle":
+        boundary = Seed(id="outer", z=_z(b["z"]), r=float(b["r"]),
+                        fixed=True, feature="boundary")
+    elif kind == "line":
+        boundary_edge = b.get("edge")
+        if boundary_edge not in EDGES:
+            raise ValueError(f"boundary.edge must be one of {EDGES} "
+                             f"(got {boundary_edge!r})")
+    else:
+        raise ValueError(f"boundary.type must be 'circle' or 'line' (got {kind!r})")
 
     seeds = [Seed(id=s["id"], z=_z(s["z"]), r=float(s["r"]),
                   fixed=bool(s.get("fixed", False)),
@@ -106,20 +139,49 @@ def load(path: str | Path) -> Config:
     search = dict(data.get("search", {}))
 
     cfg = Config(clip=clip, boundary=boundary, seeds=seeds,
-                 tangencies=tangencies, search=search, landscape=landscape)
+                 tangencies=tangencies, search=search, landscape=landscape,
+                 boundary_edge=boundary_edge)
     _validate(cfg)
     return cfg
 
 
+def dump(cfg: Config, path: str | Path, *, extra: dict | None = None) -> None:
+    """Write ``cfg`` back out in the schema :func:`load` reads.
+
+    ``extra`` adds top-level keys (e.g. ``"_search"`` provenance); the loader
+    ignores anything it does not know, so the file still round-trips.
+    """
+    b = cfg.boundary
+    boundary = {"type": "line", "edge": cfg.boundary_edge} if b is None else \
+        {"type": "circle", "z": [round(b.z.real, 4), round(b.z.imag, 4)],
+         "r": round(b.r, 4), "inside": True}
+    data = {
+        "paper": "a4",
+        "margin": cfg.clip.x0,
+        "landscape": cfg.landscape,
+        "boundary": boundary,
+        "seeds": [{"id": s.id, "z": [round(s.z.real, 4), round(s.z.imag, 4)],
+                   "r": round(s.r, 4), "fixed": s.fixed, "feature": s.feature}
+                  for s in cfg.seeds],
+        "tangencies": [list(pair) for pair in cfg.tangencies],
+        "search": cfg.search,
+    }
+    data.update(extra or {})
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
 def _validate(cfg: Config) -> None:
     ids = {s.id for s in cfg.seeds}
     if len(ids) != len(cfg.seeds):
         raise ValueError("duplicate seed id")
     if "outer" in ids:
         raise ValueError("'outer' is reserved for the boundary circle")
+    if ids & set(EDGES):
+        raise ValueError(f"seed ids {sorted(ids & set(EDGES))} are reserved for "
+                         "the margin edges")
 
     # tangency references resolve
-    valid = ids | {"outer"}
+    valid = ids | {"outer"} | set(EDGES)
     for a, b in cfg.tangencies:
         for ref in (a, b):
             if ref not in valid:
@@ -3,7 +3,8 @@ scalar terms that the search objective will later care about.
 
 Run::
 
-    python diagnostics.py seeds/irregular_frame.json [out.png]
+    python diagnostics.py seeds/irregular_frame.json [out.png] [--engine vectorized]
+    python diagnostics.py seeds/irregular_frame.json --max-circles 200   # streamed
 
 Build this *before* the optimizer (plan step 4): a trustworthy diagnostic is what
 lets the objective ``L`` be calibrated against visual judgement.
@@ -11,8 +12,9 @@ lets the objective ``L`` be calibrated against visual judgement.
 
 from __future__ import annotations
 
+import argparse
 import sys
-from collections import defaultdict
+import time
 
 import matplotlib
 matplotlib.use("Agg")
@@ -21,46 +23,127 @@ import numpy as np
 from matplotlib.patches import Circle as MplCircle
 from matplotlib.patches import Rectangle
 
+from arrays import CircleArrays, contains_disks
 from config import load
-from packing import pack
+from engines import PACK_ENGINES, STATS_ENGINES, pack_with
+from packing import PackingGraph, PackStats, pack_graph, pack_iter
 from snap import snap
 
 # Size bands (mm) - tune per paper.  Circles in [eye_min, eye_max] are usable eyes.
 EYE_MIN, EYE_MAX = 6.0, 45.0
+# Per-gap coherence aggregate: the q-quantile of the per-gap log-radius jumps
+# (1.0 = worst gap).  Seed JSON ``search.coherence_q`` overrides it.
+COHERENCE_Q = 0.9
 
 
-def analyse(cfg, circles):
+def analyse(cfg, circles, *, graph: PackingGraph | None = None,
+            coherence_q: float | None = None):
     """Return the scalar terms a search objective would weigh.
 
+    ``circles`` is a ``list[Circle]`` or a :class:`arrays.CircleArrays`; every
+    term is an array reduction, so the search loop can hand over arrays with
+    no per-circle Python work.
+
     Coherence / size statistics are computed over **uncropped circles only**
     (those fully inside the clip).  This matters once the seed set includes one
     or more very large circles used as a flat-boundary (``k=0`` line)
     approximation: those croppable circles must shape the packing without
     polluting the coherence aggregation.
+
+    With the packing's ``graph`` (:func:`packing.pack_graph`) the per-gap
+    coherence terms are added too, see :func:`gap_jumps`.
     """
-    circles = [c for c in circles if cfg.clip.contains_disk(c)]
-    if not circles:
-        return {"n_circles": 0, "n_eye_band": 0, "logr_spread": 0.0,
-                "r_min": 0.0, "r_max": 0.0, "eye_spatial_spread": 0.0, "gens": {}}
-    radii = np.array([c.r for c in circles])
-    logr = np.log(radii)
-    by_gen = defaultdict(list)
-    for c in circles:
-        by_gen[c.depth].append(c.r)
+    arr = circles if isinstance(circles, CircleArrays) \
+        else CircleArrays.from_circles(list(circles))
+    z, radii = arr.z, arr.r
+    keep = contains_disks(cfg.clip, z, radii)
+    z, radii, depth = z[keep], radii[keep], arr.depth[keep]
+    terms = {"n_circles": 0, "n_eye_band": 0, "logr_spread": 0.0,
+             "r_min": 0.0, "r_max": 0.0, "eye_spatial_spread": 0.0, "gens": {}}
+    if len(radii):
+        eye = (radii >= EYE_MIN) & (radii <= EYE_MAX)
+        ze = z[eye]
+        gens, counts = np.unique(depth, return_counts=True)
+        terms.update({
+            "n_circles": int(len(radii)),
+            "n_eye_band": int(eye.sum()),
+            "logr_spread": float(np.log(radii).std()),
+            "r_min": float(radii.min()),
+            "r_max": float(radii.max()),
+            "eye_spatial_spread": float(np.hypot(ze.real.std(), ze.imag.std()))
+            if len(ze) > 1 else 0.0,
+            "gens": dict(zip(gens.tolist(), counts.tolist())),
+        })
+    if graph is not None:
+        terms.update(coherence_terms(cfg, graph, coherence_q=coherence_q))
+    return terms
+
+
+def coherence_terms(cfg, graph: PackingGraph, *,
+                    coherence_q: float | None = None) -> dict:
+    """The per-gap terms :func:`analyse` adds when given the packing graph."""
+    if coherence_q is None:
+        coherence_q = float(cfg.search.get("coherence_q", COHERENCE_Q))
+    jumps = gap_jumps(graph, cfg.clip)
+    return {
+        "n_gaps": int(len(jumps)),
+        "gap_jump": float(np.quantile(jumps, coherence_q)) if len(jumps) else 0.0,
+        "gap_jump_max": float(jumps.max()) if len(jumps) else 0.0,
+    }
 
-    eye_band = [c for c in circles if EYE_MIN <= c.r <= EYE_MAX]
-    centers = np.array([[c.z.real, c.z.imag] for c in eye_band]) if eye_band \
-        else np.zeros((0, 2))
-    spread = float(np.hypot(*centers.std(axis=0))) if len(centers) > 1 else 0.0
 
+def gap_jumps(graph: PackingGraph, clip) -> np.ndarray:
+    """Per-gap log-radius jump, vectorized over all filled gaps.
+
+    For each gap with an inscribed circle, the largest ``|log r_child - log
+    r_i|`` over its three bounding circles - how abruptly the packing steps
+    down inside that curvilinear triangle.  One bad triangle hides behind
+    many good ones in a global spread, so the objective aggregates these with
+    a max or high quantile instead.  As in :func:`analyse`, only uncropped
+    circles count: gaps whose child is cropped are skipped, and cropped or
+    enclosing (``k < 0``) bounding circles are ignored.
+    """
+    usable = (graph.k > 0) & contains_disks(clip, graph.z, graph.r)
+    logr = np.log(graph.r)
+    child = graph.gap_child
+    filled = child >= 0
+    child, tri = child[filled], graph.gaps[filled]
+    ok = usable[child][:, None] & usable[tri]
+    jump = np.where(ok, np.abs(logr[child][:, None] - logr[tri]), -np.inf).max(axis=1)
+    return jump[np.isfinite(jump)]
+
+
+def _masked_std(v: np.ndarray, m: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Row-wise population std of ``v`` over mask ``m`` (``n`` = row counts)."""
+    nn = np.maximum(n, 1)
+    mean = np.where(m, v, 0.0).sum(axis=1) / nn
+    var = np.where(m, (v - mean[:, None]) ** 2, 0.0).sum(axis=1) / nn
+    return np.sqrt(var)
+
+
+def analyse_population(cfg, pop):
+    """:func:`analyse` for a whole :class:`arrays.PopulationArrays` batch.
+
+    Same terms, each an array with one entry per candidate (``gens`` maps
+    generation -> count array), computed with masked array reductions - no
+    per-candidate Python loop.
+    """
+    z, r = pop.z, pop.r
+    ok = pop.valid & contains_disks(cfg.clip, z, r)
+    n = ok.sum(axis=1)
+    logr = np.log(np.where(ok, r, 1.0))
+    eye = ok & (r >= EYE_MIN) & (r <= EYE_MAX)
+    n_eye = eye.sum(axis=1)
+    spread = np.hypot(_masked_std(z.real, eye, n_eye), _masked_std(z.imag, eye, n_eye))
     return {
-        "n_circles": len(circles),
-        "n_eye_band": len(eye_band),
-        "logr_spread": float(logr.std()),
-        "r_min": float(radii.min()),
-        "r_max": float(radii.max()),
-        "eye_spatial_spread": spread,
-        "gens": {g: len(v) for g, v in sorted(by_gen.items())},
+        "n_circles": n,
+        "n_eye_band": n_eye,
+        "logr_spread": np.where(n > 0, _masked_std(logr, ok, n), 0.0),
+        "r_min": np.where(n > 0, np.where(ok, r, np.inf).min(axis=1), 0.0),
+        "r_max": np.where(n > 0, np.where(ok, r, -np.inf).max(axis=1), 0.0),
+        "eye_spatial_spread": np.where(n_eye > 1, spread, 0.0),
+        "gens": {int(g): (ok & (pop.depth == g)).sum(axis=1)
+                 for g in np.unique(pop.depth)},
     }
 
 
@@ -73,10 +156,11 @@ def plot(cfg, circles, out_path: str) -> None:
     ax.add_patch(Rectangle((clip.x0, clip.y0), clip.x1 - clip.x0,
                            clip.y1 - clip.y0, fill=False, lw=0.8, ec="0.4",
                            ls="--"))
-    # enclosing circle (the packing boundary)
+    # enclosing circle (the packing boundary); a line boundary is a margin edge
     out = cfg.outer_circle()
-    ax.add_patch(MplCircle((out.z.real, out.z.imag), out.r, fill=False,
-                           lw=0.8, ec="tab:red", ls=":"))
+    if not out.is_line:
+        ax.add_patch(MplCircle((out.z.real, out.z.imag), out.r, fill=False,
+                               lw=0.8, ec="tab:red", ls=":"))
 
     depths = [c.depth for c in circles]
     dmax = max(depths) if depths else 1
@@ -96,20 +180,53 @@ def plot(cfg, circles, out_path: str) -> None:
 
 
 def main(argv):
-    path = argv[1] if len(argv) > 1 else "seeds/irregular_frame.json"
-    out_path = argv[2] if len(argv) > 2 else "diagnostic.png"
-
-    cfg = load(path)
-    seeds = snap(cfg, verbose=True)
+    ap = argparse.ArgumentParser(prog=argv[0], description=__doc__.split("\n")[0])
+    ap.add_argument("path", nargs="?", default="seeds/irregular_frame.json")
+    ap.add_argument("out_path", nargs="?", default="diagnostic.png")
+    ap.add_argument("--engine", choices=PACK_ENGINES, default="recursive")
+    ap.add_argument("--max-circles", type=int, default=None,
+                    help="stream largest-first and stop after N circles")
+    ap.add_argument("--max-seconds", type=float, default=None,
+                    help="stream largest-first and stop after T seconds")
+    args = ap.parse_args(argv[1:])
+
+    cfg = load(args.path)
+    graph, pstats = None, PackStats()
+    seeds = [*snap(cfg, verbose=True), *cfg.edge_lines()]
     outer = cfg.outer_circle()
-    circles = pack(seeds, outer, cfg.clip, r_min=cfg.r_min)
-
-    stats = analyse(cfg, circles)
+    if args.max_circles is not None or args.max_seconds is not None:
+        circles = []
+        t0 = time.perf_counter()
+        for c in pack_iter(seeds, outer, cfg.clip, r_min=cfg.r_min,
+                           max_circles=args.max_circles,
+                           max_seconds=args.max_seconds, stats=pstats):
+            circles.append(c)
+            if len(circles) % 500 == 0:
+                print(f"  ... {len(circles)} circles, r = {c.r:.3g} mm, "
+                      f"{time.perf_counter() - t0:.2f} s")
+        print(f"streamed {len(circles)} circles in "
+              f"{time.perf_counter() - t0:.3f} s (smallest r = "
+              f"{min((c.r for c in circles), default=0.0):.3g} mm)")
+    elif args.engine == "recursive":
+        circles, graph = pack_graph(seeds, outer, cfg.clip, r_min=cfg.r_min,
+                                    stats=pstats)
+    elif args.engine in STATS_ENGINES:
+        circles = pack_with(args.engine, seeds, outer, cfg.clip, r_min=cfg.r_min,
+                            stats=pstats)
+    else:
+        circles = pack_with(args.engine, seeds, outer, cfg.clip, r_min=cfg.r_min)
+        print(f"\n(no packing stats: the {args.engine} engine collects none)")
+
+    if pstats.gaps:
+        print(f"\n--- packing stats ({1e3 * pstats.seconds:.1f} ms) ---")
+        print(pstats.report())
+
+    stats = analyse(cfg, circles, graph=graph)
     print("\n--- objective terms ---")
     for k, v in stats.items():
         print(f"  {k}: {v}")
 
-    plot(cfg, circles, out_path)
+    plot(cfg, circles, args.out_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+"""Packing-engine registry: one name -> one ``pack``-compatible function.
+
+Every engine takes ``(seeds, outer, clip, *, r_min, max_depth)`` and returns
+the same set of circles; they differ only in how the gap tree is walked.  The
+sketch and diagnostics pick one by name (``PACK_ENGINES``).  ``exact`` only
+accepts integral seed configs and ``canonical`` only three-seed Descartes
+quadruples (both raise ``ValueError`` otherwise).  ``stats`` (a
+:class:`packing.PackStats`) is filled by the ``STATS_ENGINES``; the other two
+walk a rational / cached gasket with no counters and reject it.
+"""
+
+from __future__ import annotations
+
+from arrays import pack_arrays
+from canonical import pack_canonical
+from exact import pack_exact
+from geometry import Circle
+from packing import PackStats, Rect, pack, pack_stack
+
+PACK_ENGINES = ["recursive", "vectorized", "stack", "breadth", "exact",
+                "canonical"]
+STATS_ENGINES = ["recursive", "vectorized", "stack", "breadth"]
+
+
+def pack_with(engine: str, seeds: list[Circle], outer: Circle, clip: Rect, *,
+              r_min: float = 1.5, max_depth: int = 40,
+              stats: PackStats | None = None) -> list[Circle]:
+    """Pack with the named engine and return a ``list[Circle]``."""
+    if stats is not None and engine in PACK_ENGINES and engine not in STATS_ENGINES:
+        raise ValueError(f"the {engine} engine collects no PackStats "
+                         f"(engines that do: {STATS_ENGINES})")
+    if engine == "recursive":
+        return pack(seeds, outer, clip, r_min=r_min, max_depth=max_depth,
+                    stats=stats)
+    if engine in ("stack", "breadth"):
+        order = "depth" if engine == "stack" else "breadth"
+        return pack_stack(seeds, outer, clip, r_min=r_min, max_depth=max_depth,
+                          order=order, stats=stats)
+    if engine == "vectorized":
+        return pack_arrays(seeds, outer, clip, r_min=r_min,
+                           max_depth=max_depth, stats=stats).to_circles()
+    if engine == "exact":
+        return pack_exact(seeds, outer, clip, r_min=r_min, max_depth=max_depth)
+    if engine == "canonical":
+        return pack_canonical(seeds, outer, clip, r_min=r_min,
+                              max_depth=max_depth).to_circles()
+    raise ValueError(f"unknown packing engine {engine!r} "
+                     f"(choose from {PACK_ENGINES})")
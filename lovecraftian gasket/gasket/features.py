@@ -3,10 +3,28 @@
 The defining trick (what makes an eye read as "manga"): the specular highlights
 are **negative space** - we shade the pupil/iris *around* the highlight discs
 rather than drawing them.  Implemented by subtracting the highlight discs from
-the shaded region (Shapely) before hatching/stippling/contouring.
+the shaded region (Shapely) before hatching/stippling/contouring.  Contours
+skip Shapely altogether: rings are clipped against the highlight discs in
+closed form, and stipple is batch-sampled with ``shapely.contains_xy``.
 
 All feature functions take ``(vsk, circle, style)`` and draw at millimetre
 coordinates (the sketch sets ``vsk.scale("mm")``).
+
+The expensive part of a feature - Shapely disks, the specular ``difference``
+and the hatch / contour clipping - depends on the circle only through its
+radius.  Those regions are therefore rendered once per ``(kind, radius
+bucket, style)`` into penfill Geometry in unit coordinates (``_TEMPLATES``)
+and placed per circle with a scale + translate; the per-eye size jitter and
+iris offset only change that transform.  Buckets are ``TEMPLATE_STEP`` apart
+in log-radius, so hatch spacing drifts by at most half a step.  Stipple dots
+are random per circle and the orifice's teeth / streaks are its identity, so
+those are still built per circle.
+
+Level of detail is set by ``style.pen_width`` and ``style.chord_tol`` (mm):
+curves are tessellated to the chord tolerance rather than a fixed vertex
+count, hatch / contour spacing never drops below one pen width, and details
+narrower than the pen - highlights, teeth, streaks, iris arcs, whole shaded
+regions - are dropped, since the ink would close over them anyway.
 """
 
 from __future__ import annotations
@@ -15,19 +33,45 @@ import math
 import pathlib
 import sys
 
+import numpy as np
+import shapely
 import shapely.geometry as sg
 from shapely.ops import unary_union
 
 _REPO = pathlib.Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(_REPO))
-from penfill import FillSpec, draw_geometry, fill_polygon  # noqa: E402
+from penfill import FillSpec, Geometry, draw_geometry, fill_polygon  # noqa: E402
+from penfill.geometry import clip_polyline  # noqa: E402
 
 from geometry import Circle  # noqa: E402
 from style import Style  # noqa: E402
 
 
-def _disk(z: complex, r: float, segs: int = 64) -> sg.Polygon:
-    return sg.Point(z.real, z.imag).buffer(r, quad_segs=segs)
+TEMPLATE_STEP = 0.04        # radius-bucket width, as a fraction of the radius
+TEMPLATE_ENTRIES = 512      # templates kept before the oldest are dropped
+STIPPLE_DOT = 0.18          # stipple dot radius (mm)
+
+# Module-level: survives sketch re-instantiation between draw() calls.
+_TEMPLATES: dict = {}       # (kind, bucket, style tuple) -> unit-radius Geometry
+
+
+# --------------------------------------------------------------------------- #
+# Level of detail
+# --------------------------------------------------------------------------- #
+def _segs(r: float, tol: float) -> int:
+    """Vertices for a full circle of radius ``r`` with chord error <= ``tol``."""
+    if r <= tol:
+        return 8
+    return max(8, min(512, math.ceil(math.pi / math.acos(1.0 - tol / r))))
+
+
+def _spacing(spacing: float, style: Style) -> float:
+    """Line spacing clamped to the pen width (closer lines just overlap)."""
+    return max(spacing, style.pen_width)
+
+
+def _disk(z: complex, r: float, tol: float) -> sg.Polygon:
+    return sg.Point(z.real, z.imag).buffer(r, quad_segs=max(2, _segs(r, tol) // 4))
 
 
 def _size_mult(vsk, style: Style) -> float:
@@ -58,6 +102,13 @@ def _offset(vsk, style: Style, z: complex, r: float, room: float) -> complex:
     return off
 
 
+def _lines(geom, layer: int) -> Geometry:
+    """A Shapely (multi)line as penfill stroke primitives on ``layer``."""
+    parts = getattr(geom, "geoms", [geom])
+    return [("S", layer, list(g.coords), False) for g in parts
+            if g.geom_type == "LineString" and len(g.coords) >= 2]
+
+
 def _draw_shapely(vsk, geom, layer: int) -> None:
     """Draw a Shapely geometry's lines/boundaries on ``layer``."""
     if geom.is_empty:
@@ -69,56 +120,195 @@ def _draw_shapely(vsk, geom, layer: int) -> None:
 # --------------------------------------------------------------------------- #
 # Shading: fill a (possibly holed) region while leaving the holes as blanks.
 # --------------------------------------------------------------------------- #
-def _shade_region(vsk, region: sg.Polygon, *, center: complex, radius: float,
-                  style: Style) -> None:
-    if region.is_empty:
-        return
-    mode = style.shading_mode
+def _shade_geometry(region: sg.Polygon, *, center: complex, radius: float,
+                    style: Style,
+                    cutouts: list[tuple[complex, float]] | None = None) -> Geometry:
+    """Hatch / contour shading of ``region`` as penfill Geometry (deterministic
+    modes only - stipple is drawn directly by :func:`_shade_region`).
+
+    With ``cutouts`` the caller vouches that ``region`` is exactly
+    ``disk(center, radius)`` minus those ``(centre, radius)`` discs, and
+    contours are clipped analytically instead of through Shapely.
+    """
+    if region.is_empty or radius < style.pen_width:
+        return []                   # sub-pen region: the outline already covers it
     layer = style.fill_layer
 
     # "ringed" is an eye-specific style; for generic regions (tissue / orifice
     # throats) it falls back to plain hatch so the series stays coherent.
-    if mode in ("hatch", "ringed"):
-        draw_geometry(vsk, fill_polygon(region, FillSpec(
+    if style.shading_mode in ("hatch", "ringed"):
+        return fill_polygon(region, FillSpec(
             "hatch", layer,
-            dict(spacing=style.hatch_spacing, angle=style.hatch_angle))))
-
-    elif mode == "contour":
-        rings = []
-        rr = style.contour_spacing
-        while rr < radius:
-            ring = _disk(center, rr).exterior
-            clipped = ring.intersection(region)
-            if not clipped.is_empty:
-                rings.append(clipped)
-            rr += style.contour_spacing
-        if rings:
-            _draw_shapely(vsk, unary_union(rings), layer)
-
-    elif mode == "stipple":
-        n = max(1, int(style.stipple_density * math.pi * radius * radius))
-        minx, miny, maxx, maxy = region.bounds
-        vsk.stroke(layer)
-        placed = 0
-        attempts = 0
-        while placed < n and attempts < n * 12:
-            attempts += 1
-            x = vsk.random(minx, maxx)
-            y = vsk.random(miny, maxy)
-            if region.contains(sg.Point(x, y)):
-                vsk.circle(x, y, radius=0.18)
-                placed += 1
-
-
-def _speculars(center: complex, pr: float, style: Style) -> list[sg.Polygon]:
-    """Negative-space highlight discs, offset toward the upper-left."""
+            dict(spacing=_spacing(style.hatch_spacing, style),
+                 angle=style.hatch_angle)))
+
+    geom: Geometry = []
+    if style.shading_mode == "contour":
+        step = _spacing(style.contour_spacing, style)
+        radii = step * np.arange(1, math.ceil(radius / step) + 1)
+        radii = radii[radii < radius]
+        if cutouts is not None:
+            return _contour_arcs(center, radii, cutouts, layer, style.chord_tol)
+        for rr in radii:
+            ring = _disk(center, rr, style.chord_tol).exterior
+            geom += clip_polyline(ring.coords, region, layer)
+    return geom
+
+
+def _contour_arcs(center: complex, radii: np.ndarray,
+                  cutouts: list[tuple[complex, float]], layer: int,
+                  tol: float) -> Geometry:
+    """Concentric rings about ``center`` minus the ``cutouts`` discs, clipped
+    in closed form: a ring of radius rho loses the angles where
+    ``cos(t - phi) > (rho^2 + d^2 - rc^2) / (2 rho d)`` for each cut-out disc
+    at distance ``d``, direction ``phi`` and radius ``rc``."""
+    two_pi = 2 * math.pi
+    blocked = [[] for _ in radii]               # per ring: [(start, end)]
+    gone = np.zeros(len(radii), bool)
+    for zc, rc in cutouts:
+        d = abs(zc - center)
+        if d < 1e-12:                           # concentric cut-out
+            gone |= radii < rc
+            continue
+        kappa = (radii ** 2 + d * d - rc * rc) / (2 * radii * d)
+        gone |= kappa <= -1.0
+        phi = math.atan2(zc.imag - center.imag, zc.real - center.real)
+        half = np.arccos(np.clip(kappa, -1.0, 1.0))
+        for i in np.flatnonzero((kappa < 1.0) & (kappa > -1.0)):
+            blocked[i].append((phi - half[i], phi + half[i]))
+
+    geom: Geometry = []
+    for rho, cuts, dead in zip(radii.tolist(), blocked, gone):
+        if dead:
+            continue
+        n_full = _segs(rho, tol)
+        if not cuts:
+            t = np.linspace(0.0, two_pi, n_full, endpoint=False)
+            geom.append(("S", layer, _ring_pts(center, rho, t), True))
+            continue
+        # Measure angles from the end of the first cut so nothing wraps: the
+        # visible arcs are the gaps between merged cuts inside [0, 2 pi].
+        base = cuts[0][1]
+        spans = []
+        for a, b in cuts:
+            s0 = (a - base) % two_pi
+            s1 = s0 + (b - a)
+            spans.append((s0, min(s1, two_pi)))
+            if s1 > two_pi:
+                spans.append((0.0, s1 - two_pi))
+        spans.sort()
+        at = 0.0
+        for s0, s1 in spans + [(two_pi, two_pi)]:
+            if s0 > at:
+                n = max(2, math.ceil(n_full * (s0 - at) / two_pi))
+                t = base + np.linspace(at, s0, n + 1)
+                geom.append(("S", layer, _ring_pts(center, rho, t), False))
+            at = max(at, s1)
+    return geom
+
+
+def _ring_pts(center: complex, rho: float, t: np.ndarray) -> list:
+    return list(zip((center.real + rho * np.cos(t)).tolist(),
+                    (center.imag + rho * np.sin(t)).tolist()))
+
+
+def _shade_region(vsk, region: sg.Polygon, *, center: complex, radius: float,
+                  style: Style) -> None:
+    if region.is_empty:
+        return
+    if style.shading_mode != "stipple":
+        draw_geometry(vsk, _shade_geometry(region, center=center, radius=radius,
+                                           style=style))
+        return
+
+    dot = STIPPLE_DOT if 2 * STIPPLE_DOT >= style.pen_width else 0.0
+    vsk.stroke(style.fill_layer)
+    for x, y in _stipple_points(vsk, region, radius, style).tolist():
+        if dot:
+            vsk.circle(x, y, radius=dot)
+        else:                               # the pen tip is the dot
+            vsk.point(x, y)
+
+
+def _stipple_points(vsk, region: sg.Polygon, radius: float,
+                    style: Style) -> np.ndarray:
+    """Up to ``stipple_density * pi r^2`` uniform dots in ``region`` ((n, 2)).
+
+    Rejection sampling in batches against the prepared region; the batch
+    generator is seeded with one draw from the sketch's stream, so the dots
+    are reproducible under ``vsk.randomSeed`` (or a recorder's substream).
+    Same budget as one-at-a-time sampling: at most ``12 n`` candidates.
+    """
+    n = max(1, int(style.stipple_density * math.pi * radius * radius))
+    rng = np.random.default_rng(int(vsk.random(0, 2 ** 31)))
+    minx, miny, maxx, maxy = region.bounds
+    box = max((maxx - minx) * (maxy - miny), 1e-12)
+    accept = max(region.area / box, 0.05)
+    shapely.prepare(region)
+    found, need, budget = [], n, 12 * n
+    while need > 0 and budget > 0:
+        m = min(budget, max(64, math.ceil(1.2 * need / accept)))
+        xy = rng.uniform((minx, miny), (maxx, maxy), size=(m, 2))
+        hit = xy[shapely.contains_xy(region, xy[:, 0], xy[:, 1])][:need]
+        found.append(hit)
+        need -= len(hit)
+        budget -= m
+    return np.concatenate(found) if found else np.zeros((0, 2))
+
+
+# --------------------------------------------------------------------------- #
+# Instanced templates: build at a bucket radius, store at unit radius, place
+# per circle with a scale + translate.
+# --------------------------------------------------------------------------- #
+def _place(geom: Geometry, z: complex, s: float) -> Geometry:
+    """``geom`` scaled by ``s`` about the origin, then translated to ``z``."""
+    x0, y0 = z.real, z.imag
+    out: Geometry = []
+    for prim in geom:
+        if prim[0] == "F":
+            _, layer, shell, holes = prim
+            out.append(("F", layer, [(x0 + s * x, y0 + s * y) for x, y in shell],
+                        [[(x0 + s * x, y0 + s * y) for x, y in h] for h in holes]))
+        else:
+            _, layer, pts, closed = prim
+            out.append(("S", layer, [(x0 + s * x, y0 + s * y) for x, y in pts],
+                        closed))
+    return out
+
+
+def _template(kind: str, r: float, style: Style, build) -> Geometry:
+    """Unit-radius Geometry for ``kind`` near radius ``r``.
+
+    ``build(rb)`` renders the feature centred on the origin at the bucket
+    radius ``rb`` (so mm-valued spacings are honoured at that size).
+    """
+    step = math.log1p(TEMPLATE_STEP)
+    b = round(math.log(max(r, 1e-6)) / step)
+    key = (kind, b, tuple(vars(style).values()))   # shallow: all fields hashable
+    geom = _TEMPLATES.get(key)
+    if geom is None:
+        rb = math.exp(b * step)
+        geom = _place(build(rb), 0j, 1.0 / rb)
+        _TEMPLATES[key] = geom
+        while len(_TEMPLATES) > TEMPLATE_ENTRIES:
+            del _TEMPLATES[next(iter(_TEMPLATES))]
+    return geom
+
+
+def _speculars(center: complex, pr: float,
+               style: Style) -> list[tuple[complex, float]]:
+    """Negative-space highlight discs ``(centre, radius)``, offset toward the
+    upper-left."""
     off = style.specular_off * pr
     discs = []
     main_c = center + complex(-off, -off)        # up-left (screen y is down)
-    discs.append(_disk(main_c, style.specular_main * pr))
-    if style.specular_count >= 2:
+    main_r = style.specular_main * pr
+    if 2 * main_r >= style.pen_width:
+        discs.append((main_c, main_r))
+    sec_r = main_r * 0.42
+    if style.specular_count >= 2 and 2 * sec_r >= style.pen_width:
         sec_c = center + complex(off * 0.55, off * 0.55)  # small, lower-right
-        discs.append(_disk(sec_c, style.specular_main * pr * 0.42))
+        discs.append((sec_c, sec_r))
     return discs
 
 
@@ -127,14 +317,14 @@ def _speculars(center: complex, pr: float, style: Style) -> list[sg.Polygon]:
 # Angles are in radians, screen space (y points down).
 # --------------------------------------------------------------------------- #
 def _annular_sector(center: complex, r_in: float, r_out: float,
-                    a0: float, a1: float, segs: int = 40) -> sg.Polygon:
+                    a0: float, a1: float, tol: float) -> sg.Polygon:
     """A wedge between radii ``r_in..r_out`` and angles ``a0..a1``.
 
     With ``r_in == 0`` this is a pie slice; ``r_in > 0`` blunts the apex
     (annular sector) so the centre is less pointy.
     """
     cx, cy = center.real, center.imag
-    n = max(2, int(segs * (a1 - a0) / math.pi) + 2)
+    n = max(2, math.ceil(_segs(r_out, tol) * (a1 - a0) / (2 * math.pi)))
     outer = [(cx + r_out * math.cos(a0 + (a1 - a0) * i / n),
               cy + r_out * math.sin(a0 + (a1 - a0) * i / n)) for i in range(n + 1)]
     if r_in <= 1e-9:
@@ -147,9 +337,9 @@ def _annular_sector(center: complex, r_in: float, r_out: float,
 
 
 def _arc(center: complex, radius: float, a0: float, a1: float,
-         segs: int = 48) -> sg.LineString:
+         tol: float) -> sg.LineString:
     cx, cy = center.real, center.imag
-    n = max(2, int(segs * (a1 - a0) / math.pi) + 2)
+    n = max(2, math.ceil(_segs(radius, tol) * (a1 - a0) / (2 * math.pi)))
     return sg.LineString([(cx + radius * math.cos(a0 + (a1 - a0) * i / n),
                            cy + radius * math.sin(a0 + (a1 - a0) * i / n))
                           for i in range(n + 1)])
@@ -184,7 +374,7 @@ def _eye_ringed(vsk, c: Circle, style: Style) -> None:
     # to cover the outline and bite into the iris rings (all as negative space).
     reach = max(0.05, style.specular_reach)
     spec = _annular_sector(ze, style.specular_inner_ratio * pr, pr * reach,
-                           a - half_spec, a + half_spec)
+                           a - half_spec, a + half_spec, style.chord_tol)
 
     # sclera (centred)
     vsk.stroke(style.stroke_layer)
@@ -194,16 +384,18 @@ def _eye_ringed(vsk, c: Circle, style: Style) -> None:
     # A fixed *count* (not mm spacing) keeps the arc density consistent across
     # eyes of very different sizes.  ``iris_ring_taper_deg`` shortens each ring
     # inward by that many degrees (outermost ring full length), giving a fan.
+    # On small eyes the count is capped so the arcs stay a pen width apart.
     rings = []
     iris_inner = pr * 1.18
-    n = max(1, int(style.iris_ring_count))
+    n = max(1, min(int(style.iris_ring_count),
+                   int((iris_outer - iris_inner) / style.pen_width)))
     taper = math.radians(style.iris_ring_taper_deg)
     if iris_outer > iris_inner:
         step = (iris_outer - iris_inner) / n
         for i in range(n):
             rr = iris_inner + (i + 0.5) * step
             hw = max(math.radians(3.0), half_iris - (n - 1 - i) * taper / 2)
-            arc = _arc(ze, rr, a - hw, a + hw)
+            arc = _arc(ze, rr, a - hw, a + hw, style.chord_tol)
             if reach > 1.0:                     # specular eats into the iris
                 arc = arc.difference(spec)
             if not arc.is_empty:
@@ -212,20 +404,35 @@ def _eye_ringed(vsk, c: Circle, style: Style) -> None:
         _draw_shapely(vsk, unary_union(rings), style.fill_layer)
 
     # pupil outline - full circle, unless the specular reaches past it (then the
-    # outline is broken where the wedge covers it).
-    vsk.stroke(style.stroke_layer)
-    if reach > 1.0:
-        outline = _disk(ze, pr).exterior.difference(spec)
-        _draw_shapely(vsk, outline, style.stroke_layer)
-    else:
+    # outline is broken where the wedge covers it) - plus the hatched pupil
+    # minus the sector specular (negative space); instanced by pupil radius.
+    if reach <= 1.0:
+        vsk.stroke(style.stroke_layer)
         vsk.circle(ze.real, ze.imag, radius=pr)
+    draw_geometry(vsk, _place(_template("ringed_pupil", pr, style,
+                                        lambda rb: _ringed_pupil(rb, style)),
+                              ze, pr))
 
-    # hatched pupil minus the sector specular (negative space)
-    pupil = _disk(ze, pr).difference(spec)
-    if not pupil.is_empty:
-        draw_geometry(vsk, fill_polygon(pupil, FillSpec(
+
+def _ringed_pupil(pr: float, style: Style) -> Geometry:
+    """The ringed eye's pupil at the origin: hatch minus the sector specular,
+    and the broken outline when the wedge reaches past the pupil."""
+    a = math.radians(style.specular_angle)
+    half_spec = math.radians(style.specular_sector_deg) / 2
+    reach = max(0.05, style.specular_reach)
+    spec = _annular_sector(0j, style.specular_inner_ratio * pr, pr * reach,
+                           a - half_spec, a + half_spec, style.chord_tol)
+    disk = _disk(0j, pr, style.chord_tol)
+    geom: Geometry = []
+    if reach > 1.0:
+        geom += _lines(disk.exterior.difference(spec), style.stroke_layer)
+    pupil = disk.difference(spec)
+    if not pupil.is_empty and pr >= style.pen_width:
+        geom += fill_polygon(pupil, FillSpec(
             "hatch", style.fill_layer,
-            dict(spacing=style.hatch_spacing, angle=style.hatch_angle))))
+            dict(spacing=_spacing(style.hatch_spacing, style),
+                 angle=style.hatch_angle)))
+    return geom
 
 
 # --------------------------------------------------------------------------- #
@@ -242,10 +449,41 @@ def eye(vsk, c: Circle, style: Style) -> None:
     pr = r * style.pupil_ratio * _size_mult(vsk, style)
 
     ze = z + _offset(vsk, style, z, r, r - ir)                 # iris+pupil group
-    vsk.circle(ze.real, ze.imag, radius=ir)                    # iris ring
-    specs = _speculars(ze, pr, style)
-    pupil = _disk(ze, pr).difference(unary_union(specs))
-    _shade_region(vsk, pupil, center=ze, radius=pr, style=style)
+    if ir - pr >= style.pen_width:                             # else merges w/ pupil
+        vsk.circle(ze.real, ze.imag, radius=ir)                # iris ring
+    if style.shading_mode == "stipple":
+        _shade_region(vsk, _pupil(ze, pr, style), center=ze, radius=pr,
+                      style=style)
+        return
+    draw_geometry(vsk, _place(_template("pupil", pr, style, lambda rb: (
+        _shade_geometry(_pupil(0j, rb, style), center=0j, radius=rb,
+                        style=style, cutouts=_speculars(0j, rb, style)))),
+        ze, pr))
+
+
+def _holed_disk(z: complex, r: float, cutouts: list[tuple[complex, float]],
+                style: Style) -> sg.Polygon:
+    disk = _disk(z, r, style.chord_tol)
+    if not cutouts:
+        return disk
+    return disk.difference(unary_union([_disk(c, rc, style.chord_tol)
+                                        for c, rc in cutouts]))
+
+
+def _pupil(z: complex, pr: float, style: Style) -> sg.Polygon:
+    """Pupil disc minus its negative-space highlights."""
+    return _holed_disk(z, pr, _speculars(z, pr, style), style)
+
+
+def _tissue_dot(z: complex, r: float, style: Style) -> list[tuple[complex, float]]:
+    # a single negative-space dot keeps it consistent with the eyes
+    if 0.44 * r < style.pen_width:
+        return []
+    return [(z + complex(-0.3 * r, -0.3 * r), 0.22 * r)]
+
+
+def _tissue(z: complex, r: float, style: Style) -> sg.Polygon:
+    return _holed_disk(z, r * 0.92, _tissue_dot(z, r, style), style)
 
 
 def tissue(vsk, c: Circle, style: Style) -> None:
@@ -253,10 +491,13 @@ def tissue(vsk, c: Circle, style: Style) -> None:
     z, r = c.z, c.r
     vsk.stroke(style.stroke_layer)
     vsk.circle(z.real, z.imag, radius=r)
-    # a single negative-space dot keeps it consistent with the eyes
-    spec = _disk(z + complex(-0.3 * r, -0.3 * r), 0.22 * r)
-    region = _disk(z, r * 0.92).difference(spec)
-    _shade_region(vsk, region, center=z, radius=r, style=style)
+    if style.shading_mode == "stipple":
+        _shade_region(vsk, _tissue(z, r, style), center=z, radius=r, style=style)
+        return
+    draw_geometry(vsk, _place(_template("tissue", r, style, lambda rb: (
+        _shade_geometry(_tissue(0j, rb, style), center=0j, radius=0.92 * rb,
+                        style=style, cutouts=_tissue_dot(0j, rb, style)))),
+        z, r))
 
 
 def orifice(vsk, c: Circle, style: Style) -> None:
@@ -264,7 +505,9 @@ def orifice(vsk, c: Circle, style: Style) -> None:
     **radial streaks** are negative space (paper) carved out of the fill, so the
     pale teeth read in stark contrast to the dark background."""
     z, r = c.z, c.r
-    n = max(3, int(style.tooth_count))
+    # at most as many teeth as fit with a base at least one pen width wide
+    fit = int(2 * math.pi * r * style.tooth_width_frac / style.pen_width)
+    n = max(3, min(int(style.tooth_count), fit))
 
     teeth = []
 
@@ -302,14 +545,16 @@ def orifice(vsk, c: Circle, style: Style) -> None:
         p1 = z + r1 * complex(math.cos(a1), math.sin(a1))
         w0 = maxw * vsk.random(0.45, 1.0)
         w1 = maxw * vsk.random(0.0, 0.35)                # taper toward the centre
-        holes.append(_strip(p0, p1, w0, w1))
+        if w0 >= style.pen_width:                        # else inked over anyway
+            holes.append(_strip(p0, p1, w0, w1))
 
     # Solid dark disc minus the negative-space holes; cross-hatch reads as black.
-    region = _disk(z, r).difference(unary_union(holes))
+    region = _disk(z, r, style.chord_tol).difference(unary_union(holes))
     if not region.is_empty:
         draw_geometry(vsk, fill_polygon(region, FillSpec(
             "hatch", style.fill_layer,
-            dict(spacing=style.hatch_spacing, angle=style.hatch_angle,
+            dict(spacing=_spacing(style.hatch_spacing, style),
+                 angle=style.hatch_angle,
                  cross=bool(style.orifice_cross_hatch)))))
 
     # Crisp ink outline around each tooth so the fangs read sharply.
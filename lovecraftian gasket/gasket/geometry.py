@@ -22,8 +22,16 @@ Descartes' Circle Theorem (complex form), for four mutually tangent circles::
 So given three mutually tangent circles and *one* known fourth circle tangent to
 all three, the other fourth circle is a pure reflection - no square roots, no
 sign ambiguity.  Seeding (when no fourth circle is known yet) uses the explicit
-``±sqrt`` form, which for **circles** (k != 0) is well behaved; both solutions are
-returned and the caller picks.
+``±sqrt`` form; both solutions are returned and the caller picks.
+
+Straight lines
+--------------
+A line is the ``k = 0`` member of the family.  Its "curvature-centre" ``w`` is
+the unit normal pointing *away* from the side being packed (the limit of
+``k * z`` for an ever larger circle), and both Descartes identities above hold
+unchanged (Lagarias-Mallows-Wilks), so seeding and reflection need no special
+case.  ``w`` alone does not place the line, so a line also carries ``offset``:
+it is ``{p : Re(conj(w) * p) = offset}``.
 """
 
 from __future__ import annotations
@@ -45,6 +53,7 @@ class Circle:
     depth: int = 0
     feature: str = ""   # assigned later by the renderer
     parent: int = -1    # index into the packing list, -1 for seeds
+    offset: float = 0.0  # lines only (k == 0): Re(conj(w) * p) = offset
 
     @classmethod
     def from_center(cls, z: complex, r: float, *, inside: bool = False,
@@ -57,15 +66,34 @@ class Circle:
         k = (-1.0 if inside else 1.0) / r
         return cls(k=k, w=k * z, depth=depth, feature=feature)
 
+    @classmethod
+    def line(cls, p: complex, normal: complex, *, feature: str = "") -> "Circle":
+        """The line through ``p`` whose ``normal`` points away from the packed
+        side (``k = 0``)."""
+        n = normal / abs(normal)
+        return cls(k=0.0, w=n, feature=feature,
+                   offset=(n.conjugate() * p).real)
+
+    @property
+    def is_line(self) -> bool:
+        return self.k == 0
+
     @property
     def z(self) -> complex:
+        """Centre; for a line, its point nearest the origin."""
+        if self.k == 0:
+            return self.w * self.offset
         return self.w / self.k
 
     @property
     def r(self) -> float:
-        return abs(1.0 / self.k)
+        return float("inf") if self.k == 0 else abs(1.0 / self.k)
 
     def __repr__(self) -> str:
+        if self.k == 0:
+            n = self.w
+            return (f"Line(normal=({n.real:.4g},{n.imag:.4g}), "
+                    f"offset={self.offset:.4g})")
         z = self.z
         return (f"Circle(z=({z.real:.4g},{z.imag:.4g}), r={self.r:.4g}, "
                 f"k={self.k:.4g}, depth={self.depth})")
@@ -121,7 +149,14 @@ def tangency_error(a: Circle, b: Circle) -> float:
     For two positive circles the tangency distance is ``r_a + r_b`` (external)
     or ``|r_a - r_b|`` (internal); we return the smaller residual so that an
     enclosing circle (negative k) reads as internally tangent to its children.
+    A circle touches a line when its centre is ``r`` from it; two lines are
+    tangent (at infinity) only when parallel and facing each other.
     """
+    if a.k == 0 or b.k == 0:
+        if a.k == 0 and b.k == 0:
+            return 0.0 if abs(a.w + b.w) < 1e-9 else float("inf")
+        line, c = (a, b) if a.k == 0 else (b, a)
+        return abs(abs(line.offset - (line.w.conjugate() * c.z).real) - c.r)
     d = abs(a.z - b.z)
     ext = abs(d - (a.r + b.r))
     internal = abs(d - abs(a.r - b.r))
@@ -129,7 +164,8 @@ def tangency_error(a: Circle, b: Circle) -> float:
 
 
 def are_tangent(a: Circle, b: Circle, tol: float = 1e-6) -> bool:
-    return tangency_error(a, b) <= tol * max(1.0, a.r, b.r)
+    scale = max([1.0] + [c.r for c in (a, b) if c.k != 0])
+    return tangency_error(a, b) <= tol * scale
 
 
 # ---------------------------------------------------------------------------
@@ -163,6 +199,22 @@ def _selfcheck() -> None:
     for parent in (inner, a, outer):
         assert are_tangent(nxt, parent), f"new circle must be tangent to {parent}"
 
+    # Lines (k = 0): a unit circle between y = 0 and y = 2 and the strip's
+    # other circles - seeding and reflection work unchanged.
+    floor = Circle.line(0j, -1j)                # packed side is y > 0
+    ceil = Circle.line(2j, 1j)
+    c = Circle.from_center(1j, 1.0)
+    assert are_tangent(floor, ceil) and are_tangent(floor, c)
+    assert not are_tangent(floor, Circle.from_center(2j, 1.0))
+    inner, outer_ = descartes_pair(floor, ceil, c)
+    assert {round(inner.z.real, 9), round(outer_.z.real, 9)} == {-2.0, 2.0}
+    assert abs(inner.r - 1.0) < 1e-9
+    cusp = soddy_reflect(ceil, floor, c, inner)  # the gap on the floor
+    print("line gap circle:", cusp, " expected r=1/4 on the floor")
+    assert abs(cusp.r - 0.25) < 1e-9 and abs(cusp.z.imag - 0.25) < 1e-9
+    for parent in (floor, c, inner):
+        assert are_tangent(cusp, parent), f"new circle must be tangent to {parent}"
+
     print("\nALL GEOMETRY SELF-CHECKS PASSED")
 
 
@@ -0,0 +1,234 @@
+"""Snap + pack result cache: module memory first, then ``cache/packings/*.npz``.
+
+``GasketSketch.draw()`` runs on every parameter change, but most changes are
+style tweaks (``shading_mode``, colours, eye proportions) that leave the packing
+untouched.  Two levels, in the spirit of ``_VOR_CACHE`` / ``_FILL_CACHE`` in
+``modulo_multiplication_03``:
+
+* **snap** - keyed on the seed file's content hash (on disk, also on a hash
+  of the snap code, so a solver change never serves stale seeds) -> the
+  snapped seeds;
+* **pack** - keyed on ``(content hash, r_min, max_depth, engine)`` (on disk,
+  also on the snap and packer code) -> circles.
+
+Both live in module-level dicts (they survive sketch re-instantiation between
+draws) and are persisted as ``.npz`` so a fresh session starts warm.  When a
+seed file changes but its layout (boundary, seed ids, tangencies) does not -
+i.e. a seed was nudged - snap is warm-started from the previous solution for
+every seed that did not move.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import threading
+
+import numpy as np
+
+from arrays import CircleArrays
+from config import Config, load
+from engines import pack_with
+from geometry import Circle
+from snap import snap
+
+_HERE = pathlib.Path(__file__).resolve().parent
+CACHE_DIR = _HERE / "cache" / "packings"
+MEMORY_ENTRIES = 16         # per level; oldest evicted first
+
+
+def _code_hash(*names: str) -> str:
+    return hashlib.sha256(b"".join((_HERE / name).read_bytes()
+                                   for name in names)).hexdigest()[:8]
+
+
+# Source hashes of the modules each level's results depend on; they are part
+# of the disk keys, so a code change never serves stale snaps or packings.
+SNAP_CODE = _code_hash("snap.py", "config.py", "geometry.py")
+PACK_CODE = _code_hash("snap.py", "config.py", "geometry.py", "packing.py",
+                       "arrays.py", "exact.py", "canonical.py", "engines.py")
+
+# Module-level caches - survive instance recreation between draw() calls.
+_SNAP_CACHE: dict = {}      # content hash -> (Config, snapped seeds)
+_PACK_CACHE: dict = {}      # (content hash, r_min, max_depth, engine) -> circles
+_LAST_SNAP: dict = {}       # layout key -> (Config, snapped seeds), for warm starts
+
+
+def content_hash(path: str | pathlib.Path) -> str:
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()[:16]
+
+
+def _remember(cache: dict, key, value) -> None:
+    cache[key] = value
+    while len(cache) > MEMORY_ENTRIES:
+        del cache[next(iter(cache))]
+
+
+def _layout(cfg: Config) -> tuple:
+    b = cfg.boundary
+    return ((b.z, b.r) if b is not None else cfg.boundary_edge,
+            tuple((s.id, s.fixed) for s in cfg.seeds),
+            tuple(map(tuple, cfg.tangencies)))
+
+
+# --------------------------------------------------------------------------- #
+# .npz store
+# --------------------------------------------------------------------------- #
+def _save(path: pathlib.Path, arr: CircleArrays) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per writer: sketch, preview thread and batch workers may race.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, k=arr.k, w=arr.w, depth=arr.depth,
+                 feature=arr.feature.astype(str))
+    os.replace(tmp, path)
+
+
+def _read(path: pathlib.Path) -> CircleArrays | None:
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return CircleArrays(k=data["k"], w=data["w"], depth=data["depth"],
+                            feature=data["feature"].astype(object))
+
+
+# --------------------------------------------------------------------------- #
+# Public API
+# --------------------------------------------------------------------------- #
+def _warm_start(cfg: Config) -> list[Circle] | None:
+    """Previous snap solution for unmoved seeds, hand-placed values for the
+    moved ones; ``None`` if there is no compatible previous solution."""
+    prev = _LAST_SNAP.get(_layout(cfg))
+    if prev is None:
+        return None
+    pcfg, pseeds = prev
+    init, moved = [], 0
+    for s, ps, c in zip(cfg.seeds, pcfg.seeds, pseeds):
+        if (s.z, s.r) == (ps.z, ps.r):
+            init.append(c)
+        else:
+            init.append(Circle.from_center(s.z, s.r, feature=s.feature))
+            moved += 1
+    return init if moved < len(cfg.seeds) else None
+
+
+def snapped(path: str | pathlib.Path, *,
+            cache_dir: pathlib.Path = CACHE_DIR) -> tuple[Config, list[Circle]]:
+    """``(cfg, snap(cfg))`` for a seed file, from memory / disk / a fresh snap."""
+    key = content_hash(path)
+    hit = _SNAP_CACHE.get(key)
+    if hit is not None:
+        return hit
+    cfg = load(path)
+    disk = cache_dir / f"{key}_{SNAP_CODE}.snap.npz"
+    arr = _read(disk)
+    if arr is not None:
+        seeds = arr.to_circles()
+    else:
+        seeds = snap(cfg, init=_warm_start(cfg))
+        _save(disk, CircleArrays.from_circles(seeds))
+    _remember(_SNAP_CACHE, key, (cfg, seeds))
+    _remember(_LAST_SNAP, _layout(cfg), (cfg, seeds))
+    return cfg, seeds
+
+
+def _pack_key(path, r_min: float, max_depth: int, engine: str) -> tuple:
+    return (content_hash(path), float(r_min), int(max_depth), engine)
+
+
+def _pack_file(key: tuple, cache_dir: pathlib.Path) -> pathlib.Path:
+    return cache_dir / f"{key[0]}_{PACK_CODE}_{key[3]}_r{key[1]:g}_d{key[2]}.npz"
+
+
+def cached(path: str | pathlib.Path, *, r_min: float, max_depth: int,
+           engine: str = "recursive", cache_dir: pathlib.Path = CACHE_DIR
+           ) -> list[Circle] | None:
+    """The cached packing for these settings, or ``None`` - never packs."""
+    key = _pack_key(path, r_min, max_depth, engine)
+    hit = _PACK_CACHE.get(key)
+    if hit is None:
+        arr = _read(_pack_file(key, cache_dir))
+        if arr is not None:
+            hit = arr.to_circles()
+            _remember(_PACK_CACHE, key, hit)
+    return hit
+
+
+def store(path: str | pathlib.Path, circles: list[Circle], *, r_min: float,
+          max_depth: int, engine: str = "recursive",
+          cache_dir: pathlib.Path = CACHE_DIR) -> None:
+    """Cache a packing computed elsewhere (e.g. by :mod:`preview`)."""
+    key = _pack_key(path, r_min, max_depth, engine)
+    _save(_pack_file(key, cache_dir), CircleArrays.from_circles(circles))
+    _remember(_PACK_CACHE, key, circles)
+
+
+def packed(path: str | pathlib.Path, *, r_min: float, max_depth: int,
+           engine: str = "recursive", cache_dir: pathlib.Path = CACHE_DIR
+           ) -> tuple[Config, list[Circle], list[Circle]]:
+    """``(cfg, seeds, circles)`` for a seed file, packing only on a miss."""
+    cfg, seeds = snapped(path, cache_dir=cache_dir)
+    circles = cached(path, r_min=r_min, max_depth=max_depth, engine=engine,
+                     cache_dir=cache_dir)
+    if circles is None:
+        circles = pack_with(engine, [*seeds, *cfg.edge_lines()],
+                            cfg.outer_circle(), cfg.clip, r_min=r_min,
+                            max_depth=max_depth)
+        store(path, circles, r_min=r_min, max_depth=max_depth, engine=engine,
+              cache_dir=cache_dir)
+    return cfg, seeds, circles
+
+
+def clear(*, disk: bool = False, cache_dir: pathlib.Path = CACHE_DIR) -> None:
+    """Drop the in-memory caches (and the ``.npz`` store if ``disk``)."""
+    _SNAP_CACHE.clear()
+    _PACK_CACHE.clear()
+    _LAST_SNAP.clear()
+    if disk and cache_dir.exists():
+        for p in cache_dir.glob("*.npz"):
+            p.unlink()
+
+
+if __name__ == "__main__":
+    import json
+    import shutil
+    import tempfile
+    import time
+
+    from packing import pack
+
+    src = _HERE / "seeds" / "irregular_frame.json"
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp)
+        seed_file = tmp / "frame.json"
+        shutil.copy(src, seed_file)
+        store_dir = tmp / "store"
+
+        t0 = time.perf_counter()
+        cfg, seeds, circles = packed(seed_file, r_min=0.5, max_depth=40,
+                                     cache_dir=store_dir)
+        t1 = time.perf_counter()
+        _, _, again = packed(seed_file, r_min=0.5, max_depth=40, cache_dir=store_dir)
+        t2 = time.perf_counter()
+        assert again is circles
+        clear()
+        _, _, from_disk = packed(seed_file, r_min=0.5, max_depth=40,
+                                 cache_dir=store_dir)
+        t3 = time.perf_counter()
+        ref = pack(snap(cfg), cfg.outer_circle(), cfg.clip, r_min=0.5)
+        assert [(c.k, c.w, c.depth) for c in from_disk] == \
+               [(c.k, c.w, c.depth) for c in ref]
+        print(f"{len(circles)} circles: cold {1e3 * (t1 - t0):.1f} ms, "
+              f"memory {1e3 * (t2 - t1):.3f} ms, disk {1e3 * (t3 - t2):.1f} ms")
+
+        # Nudge one free seed: snap warm-starts from the previous solution.
+        data = json.loads(seed_file.read_text())
+        data["seeds"][1]["z"][0] += 0.5
+        seed_file.write_text(json.dumps(data))
+        cfg2, seeds2 = snapped(seed_file, cache_dir=store_dir)
+        cold = snap(cfg2)
+        err = max(abs(a.z - b.z) + abs(a.r - b.r) for a, b in zip(seeds2, cold))
+        print(f"warm-started snap after moving s1: max diff vs cold = {err:.2g} mm")
+        assert err < 1e-3
+    print("PACK CACHE SMOKE TEST PASSED")
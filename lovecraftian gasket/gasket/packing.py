@@ -9,8 +9,12 @@ Boundary handling
 Two distinct ideas, deliberately separate:
 
 * **Packing boundary** - an enclosing circle with *negative* curvature whose
-  interior is the region being filled.  Circle-only Descartes (no ``k=0`` lines)
-  keeps the algebra robust.
+  interior is the region being filled, and/or straight ``k = 0`` lines
+  (:meth:`Rect.edge`, see :mod:`geometry`).  Lines may be passed as ``outer``
+  or among ``seeds``; they bound gaps like any circle but are never emitted,
+  so a frame can pack flat against the margin instead of approximating it
+  with huge cropped circles whose slivers the recursion would chase off the
+  page.
 * **Drawable clip** - an axis-aligned rectangle (A4 minus margins).  Any circle
   whose disk is not fully inside the clip is *discarded* (it is never emitted and
   never recursed through).  This is what lets an *irregular frame* poke past a
@@ -19,8 +23,14 @@ Two distinct ideas, deliberately separate:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from itertools import combinations
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter
+from typing import Iterator
+
+import numpy as np
+from scipy.spatial import cKDTree
 
 from geometry import Circle, descartes_pair, soddy_reflect, tangency_error
 
@@ -28,6 +38,10 @@ from geometry import Circle, descartes_pair, soddy_reflect, tangency_error
 # residuals ~1e-4 mm, far below this; the strict relative test in geometry is
 # too tight to recognise snapped seeds as tangent.
 SEED_TANGENT_TOL = 0.6
+# Seed-contact search: circles larger than this multiple of the median seed
+# radius (the enclosing boundary, giant frame seeds) are tested against every
+# member; the rest only against their k-d tree neighbourhood.
+_CONTACT_BIG = 4.0
 
 
 @dataclass(frozen=True)
@@ -47,6 +61,25 @@ class Rect:
     def contains_point(self, z: complex) -> bool:
         return self.x0 <= z.real <= self.x1 and self.y0 <= z.imag <= self.y1
 
+    def edge(self, side: str) -> Circle:
+        """One side of the rect as a ``k = 0`` line, packed side inwards.
+
+        ``side`` is one of :data:`EDGES`; ``top`` is ``y = y0`` (page
+        coordinates, y down).
+        """
+        if side == "left":
+            return Circle.line(complex(self.x0, 0), -1, feature="boundary")
+        if side == "right":
+            return Circle.line(complex(self.x1, 0), 1, feature="boundary")
+        if side == "top":
+            return Circle.line(complex(0, self.y0), -1j, feature="boundary")
+        if side == "bottom":
+            return Circle.line(complex(0, self.y1), 1j, feature="boundary")
+        raise ValueError(f"unknown edge {side!r} (choose from {EDGES})")
+
+
+EDGES = ("left", "right", "top", "bottom")
+
 
 def a4_clip(margin: float = 20.0, landscape: bool = False) -> Rect:
     """A4 (210x297 mm) drawable rectangle inset by ``margin`` mm on every side."""
@@ -63,35 +96,221 @@ DEDUP_TOL = 0.02   # mm
 _DEDUP_CELL = 0.5  # mm; bucket size for the spatial hash (>> DEDUP_TOL)
 
 
-def pack(seeds: list[Circle], outer: Circle, clip: Rect, *,
-         r_min: float = 1.5, max_depth: int = 40) -> list[Circle]:
-    """Pack the region bounded by ``outer`` and tangencies among ``seeds``.
+class SpatialDedup:
+    """Distance-tolerance dedup (``DEDUP_TOL``) over a coarse spatial hash.
 
-    ``seeds`` and ``outer`` must already be (approximately) mutually tangent
-    where they touch - run :mod:`snap` first on hand-placed circles.  Returns
-    all positive-curvature circles inside ``clip`` (the ``outer`` circle itself
-    is not emitted).
+    Circles are bucketed into ``_DEDUP_CELL`` squares; a lookup scans the 3x3
+    neighbourhood of its cell, so straddling a bucket edge never splits a pair.
     """
-    out: list[Circle] = []
-    buckets: dict[tuple[int, int], list[Circle]] = {}
 
-    members = [outer, *seeds]
+    def __init__(self) -> None:
+        self._buckets: dict[tuple[int, int], list[Circle]] = {}
 
+    @staticmethod
     def _cell(z: complex) -> tuple[int, int]:
         return (int(z.real // _DEDUP_CELL), int(z.imag // _DEDUP_CELL))
 
-    def _register(c: Circle) -> None:
-        buckets.setdefault(_cell(c.z), []).append(c)
+    def add(self, c: Circle) -> None:
+        self._buckets.setdefault(self._cell(c.z), []).append(c)
 
-    def _seen(c: Circle) -> bool:
-        cx, cy = _cell(c.z)
+    def seen(self, c: Circle) -> bool:
+        z = c.z
+        cx, cy = self._cell(z)
         for dx in (-1, 0, 1):
             for dy in (-1, 0, 1):
-                for kc in buckets.get((cx + dx, cy + dy), ()):
-                    if abs(kc.z - c.z) < DEDUP_TOL:
+                for kc in self._buckets.get((cx + dx, cy + dy), ()):
+                    if abs(kc.z - z) < DEDUP_TOL:
                         return True
         return False
 
+
+@dataclass
+class PackingGraph:
+    """Tangency graph and gap list of one packing, as compact int32 arrays.
+
+    Nodes are every circle the recursion touched: node 0 is ``outer``, nodes
+    ``1..len(seeds)`` the seeds, then each created circle - including ones that
+    poke past the clip and are never emitted (they still bound visible gaps).
+    A *gap* is a curvilinear triangle: three mutually tangent nodes, plus the
+    node inscribed in it, or -1 for the leaf gaps the recursion stopped at
+    (``r_min`` / ``max_depth``) - the interstices veins are routed through.
+    """
+
+    k: np.ndarray           # (N,) float64 signed curvature
+    w: np.ndarray           # (N,) complex128 k * z
+    depth: np.ndarray       # (N,) int32 generation
+    emitted: np.ndarray     # (N,) int32 index into pack()'s list, -1 if not emitted
+    edges: np.ndarray       # (E, 2) int32 tangent pairs, i < j, unique
+    gaps: np.ndarray        # (G, 3) int32 bounding triples
+    gap_child: np.ndarray   # (G,) int32 inscribed node, -1 for leaf gaps
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.w / np.where(self.k == 0, np.inf, self.k)
+
+    @property
+    def r(self) -> np.ndarray:
+        """Radii; ``inf`` for line nodes."""
+        with np.errstate(divide="ignore"):
+            return np.abs(1.0 / self.k)
+
+    def adjacency(self) -> tuple[np.ndarray, np.ndarray]:
+        """CSR neighbour lists ``(indptr, indices)``: node ``i``'s tangent
+        neighbours are ``indices[indptr[i]:indptr[i + 1]]``."""
+        both = np.concatenate([self.edges, self.edges[:, ::-1]])
+        both = both[np.lexsort((both[:, 1], both[:, 0]))]
+        indptr = np.searchsorted(both[:, 0], np.arange(len(self.k) + 1))
+        return indptr.astype(np.int32), both[:, 1].astype(np.int32)
+
+
+class GraphRecorder:
+    """Collects nodes / edges / gaps while :func:`pack` recurses."""
+
+    def __init__(self, outer: Circle, seeds: list[Circle]) -> None:
+        self._node: dict[int, int] = {}
+        self._circles: list[Circle] = []
+        self._edges: list[tuple[int, int]] = []
+        self._gaps: list[tuple[int, int, int, int]] = []
+        for c in (outer, *seeds):
+            self.node(c)
+
+    def node(self, c: Circle) -> int:
+        i = self._node.get(id(c))
+        if i is None:
+            i = self._node[id(c)] = len(self._circles)
+            self._circles.append(c)
+        return i
+
+    def gap(self, c1: Circle, c2: Circle, c3: Circle,
+            child: Circle | None) -> None:
+        a, b, c = self.node(c1), self.node(c2), self.node(c3)
+        if child is None:
+            self._gaps.append((a, b, c, -1))
+            return
+        n = self.node(child)
+        self._gaps.append((a, b, c, n))
+        self._edges += [(a, n), (b, n), (c, n)]
+
+    def triple(self, c1: Circle, c2: Circle, c3: Circle) -> None:
+        a, b, c = self.node(c1), self.node(c2), self.node(c3)
+        self._edges += [(a, b), (b, c), (a, c)]
+
+    def finish(self, out: list[Circle]) -> PackingGraph:
+        emitted = np.full(len(self._circles), -1, np.int32)
+        for i, c in enumerate(out):
+            emitted[self._node[id(c)]] = i
+        edges = np.sort(np.array(self._edges, np.int32).reshape(-1, 2), axis=1)
+        gaps = np.array(self._gaps, np.int32).reshape(-1, 4)
+        return PackingGraph(
+            k=np.array([c.k for c in self._circles], float),
+            w=np.array([c.w for c in self._circles], complex),
+            depth=np.array([c.depth for c in self._circles], np.int32),
+            emitted=emitted, edges=np.unique(edges, axis=0),
+            gaps=gaps[:, :3].copy(), gap_child=gaps[:, 3].copy())
+
+
+@dataclass
+class PackStats:
+    """Counters an engine fills in while packing (pass ``stats=PackStats()``).
+
+    Cheap enough to leave on: a few integer bumps and one ``perf_counter``
+    per gap.  A *gap* is visited when its inscribed circle is computed; it
+    then ends in exactly one of: reflected back to an enclosing circle,
+    ``rejected_r_min``, ``rejected_clip`` (disk entirely off the clip),
+    ``dedup_hits`` (reached before by another path), or a new circle.  Time
+    is charged to the generation (depth) of the gap being worked on; when
+    streaming with :func:`pack_iter` it includes the consumer's time too.
+    """
+
+    gaps: int = 0                 # gaps visited
+    rejected_r_min: int = 0       # inscribed circle below r_min
+    rejected_clip: int = 0        # inscribed circle fails _touches
+    dedup_hits: int = 0           # inscribed circle already seen
+    emitted: int = 0              # circles returned (incl. seeds)
+    max_depth: int = 0            # deepest generation visited
+    depth_cutoffs: int = 0        # gaps dropped at the max_depth limit
+    gen_gaps: list[int] = field(default_factory=list)       # gaps per generation
+    gen_seconds: list[float] = field(default_factory=list)  # wall time per generation
+    _t: float = field(default=0.0, repr=False)
+    _depth: int = field(default=0, repr=False)
+
+    def start(self) -> None:
+        self._grow(1)
+        self._t, self._depth = perf_counter(), 1    # seeding is generation 1
+
+    def enter(self, depth: int) -> None:
+        """Account one visited gap of generation ``depth``."""
+        now = perf_counter()                # _charge(), inlined: once per gap
+        self.gen_seconds[self._depth] += now - self._t
+        self._t, self._depth = now, depth
+        self.gaps += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+            self._grow(depth)
+        self.gen_gaps[depth] += 1
+
+    def stop(self, emitted: int) -> None:
+        self._charge()
+        self.emitted = emitted
+
+    def _grow(self, depth: int) -> None:
+        while len(self.gen_gaps) <= depth:
+            self.gen_gaps.append(0)
+            self.gen_seconds.append(0.0)
+
+    def _charge(self) -> None:
+        now = perf_counter()
+        self.gen_seconds[self._depth] += now - self._t
+        self._t = now
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.gen_seconds)
+
+    def report(self) -> str:
+        """Human-readable summary, one generation per line."""
+        lines = [f"gaps visited {self.gaps}, emitted {self.emitted}, "
+                 f"max depth {self.max_depth} ({self.depth_cutoffs} gaps cut off)",
+                 f"rejected: r_min {self.rejected_r_min}, clip {self.rejected_clip}, "
+                 f"dedup {self.dedup_hits}",
+                 "gen   gaps        ms"]
+        for d, (n, t) in enumerate(zip(self.gen_gaps, self.gen_seconds)):
+            if n or t:
+                lines.append(f"{d:3d} {n:6d} {1e3 * t:9.3f}")
+        return "\n".join(lines)
+
+
+def pack_graph(seeds: list[Circle], outer: Circle, clip: Rect, *,
+               r_min: float = 1.5, max_depth: int = 40,
+               stats: PackStats | None = None
+               ) -> tuple[list[Circle], PackingGraph]:
+    """:func:`pack` plus the :class:`PackingGraph` recorded while it recursed."""
+    record = GraphRecorder(outer, seeds)
+    out = pack(seeds, outer, clip, r_min=r_min, max_depth=max_depth,
+               record=record, stats=stats)
+    return out, record.finish(out)
+
+
+def pack(seeds: list[Circle], outer: Circle, clip: Rect, *,
+         r_min: float = 1.5, max_depth: int = 40,
+         record: GraphRecorder | None = None,
+         stats: PackStats | None = None) -> list[Circle]:
+    """Pack the region bounded by ``outer`` and tangencies among ``seeds``.
+
+    ``seeds`` and ``outer`` must already be (approximately) mutually tangent
+    where they touch - run :mod:`snap` first on hand-placed circles.  Returns
+    all positive-curvature circles inside ``clip`` (the ``outer`` circle itself
+    is not emitted).  ``record`` (see :func:`pack_graph`) collects the tangency
+    graph and gap list on the way; ``stats`` collects :class:`PackStats`.
+    """
+    out: list[Circle] = []
+    dedup = SpatialDedup()
+    _register, _seen = dedup.add, dedup.seen
+    if stats is not None:
+        stats.start()
+
+    members = [outer, *seeds]
+
     # Emit the supplied interior seeds first (so feature tags survive).
     for s in seeds:
         if s.k > 0 and clip.contains_disk(s):
@@ -100,16 +319,28 @@ def pack(seeds: list[Circle], outer: Circle, clip: Rect, *,
 
     def recurse(c1: Circle, c2: Circle, c3: Circle, known: Circle, depth: int):
         if depth > max_depth:
+            if record is not None:
+                record.gap(c1, c2, c3, None)
+            if stats is not None:
+                stats.depth_cutoffs += 1
             return
+        if stats is not None:
+            stats.enter(depth)
         child = soddy_reflect(known, c1, c2, c3)
         if child.k <= 0:                   # reflected back to an enclosing circle
             return
         if child.r < r_min:
+            if record is not None:
+                record.gap(c1, c2, c3, None)
+            if stats is not None:
+                stats.rejected_r_min += 1
             return
         # Recurse only while the circle is near/inside the clip; a circle fully
         # outside contributes no visible descendants either.
         inside = clip.contains_disk(child)
         if not inside and not _touches(child, clip):
+            if stats is not None:
+                stats.rejected_clip += 1
             return
         child = Circle(k=child.k, w=child.w, depth=depth, parent=-1)
         # Each curvilinear gap inscribes a unique circle, so a child we've already
@@ -117,23 +348,22 @@ def pack(seeds: list[Circle], outer: Circle, clip: Rect, *,
         # is identical and already explored.  Prune (prevents the 3x redundant
         # recursion that would otherwise blow up at small r_min).
         if _seen(child):
+            if stats is not None:
+                stats.dedup_hits += 1
             return
         _register(child)
+        if record is not None:
+            record.gap(c1, c2, c3, child)
         if inside:                         # only emit disks fully inside the clip
             out.append(child)
         recurse(c1, c2, child, c3, depth + 1)
         recurse(c1, c3, child, c2, depth + 1)
         recurse(c2, c3, child, c1, depth + 1)
 
-    def trio_tangent(a, b, c) -> bool:
-        return (tangency_error(a, b) <= SEED_TANGENT_TOL
-                and tangency_error(b, c) <= SEED_TANGENT_TOL
-                and tangency_error(a, c) <= SEED_TANGENT_TOL)
-
     # Seed the recursion from every mutually tangent triple in the initial set.
-    for a, b, c in combinations(members, 3):
-        if not trio_tangent(a, b, c):
-            continue
+    for a, b, c in tangent_triples(members):
+        if stats is not None:
+            stats.enter(1)
         inner, _ = descartes_pair(a, b, c)
         if inner.k <= 0:
             continue
@@ -142,15 +372,254 @@ def pack(seeds: list[Circle], outer: Circle, clip: Rect, *,
             _register(inner)
             if inner.r >= r_min and clip.contains_disk(inner):
                 out.append(inner)
+        elif stats is not None:
+            stats.dedup_hits += 1
+        if record is not None:
+            record.triple(a, b, c)
+            record.gap(a, b, c, inner)
         # Four triangles around the freshly created inner circle.
         recurse(a, b, inner, c, 2)
         recurse(a, c, inner, b, 2)
         recurse(b, c, inner, a, 2)
         recurse(a, b, c, inner, 2)        # the other lens, opposite `inner`
 
+    if stats is not None:
+        stats.stop(len(out))
     return out
 
 
+TRAVERSAL_ORDERS = ["depth", "breadth"]
+
+
+def pack_stack(seeds: list[Circle], outer: Circle, clip: Rect, *,
+               r_min: float = 1.5, max_depth: int = 40, order: str = "depth",
+               max_circles: int | None = None,
+               max_seconds: float | None = None,
+               stats: PackStats | None = None) -> list[Circle]:
+    """Iterative twin of :func:`pack`, driven by an explicit stack / heap.
+
+    No Python frame is spent per generation, so ``max_depth`` and ``r_min`` can
+    go as deep as memory allows.  ``order`` picks the traversal:
+
+    * ``"depth"``   - LIFO stack, visits gaps in exactly ``pack``'s order.
+    * ``"breadth"`` - min-heap on the curvature of each gap's inscribed circle,
+      so circles come out largest first.  A ``max_circles`` / ``max_seconds``
+      budget then drops the *smallest* circles everywhere instead of leaving
+      whole corners of the page unfilled.
+    """
+    return list(pack_iter(seeds, outer, clip, r_min=r_min, max_depth=max_depth,
+                          order=order, max_circles=max_circles,
+                          max_seconds=max_seconds, stats=stats))
+
+
+def pack_iter(seeds: list[Circle], outer: Circle, clip: Rect, *,
+              r_min: float = 1.5, max_depth: int = 40, order: str = "breadth",
+              max_circles: int | None = None,
+              max_seconds: float | None = None,
+              stats: PackStats | None = None) -> Iterator[Circle]:
+    """Streaming packing: yield circles as they are found.
+
+    With the default ``order="breadth"`` circles arrive in decreasing-radius
+    order, so a consumer (renderer, diagnostics) can start on the big eyes
+    while the packing is still running, and stopping early - by breaking out,
+    or via the ``max_circles`` / ``max_seconds`` budgets - only ever loses the
+    smallest circles.  Memory is bounded by the open gap frontier, not by the
+    full packing.  ``stats`` is completed when the stream ends (exhausted,
+    budget hit, or the consumer stops iterating).
+    """
+    deadline = None if max_seconds is None else perf_counter() + max_seconds
+    if max_circles is not None and max_circles <= 0:
+        return
+    if stats is not None:
+        stats.start()
+    n = 0
+    try:
+        for c in _walk(seeds, outer, clip, r_min=r_min, max_depth=max_depth,
+                       order=order, deadline=deadline, stats=stats):
+            yield c
+            n += 1
+            if max_circles is not None and n >= max_circles:
+                return
+    finally:
+        if stats is not None:
+            stats.stop(n)
+
+
+def _walk(seeds: list[Circle], outer: Circle, clip: Rect, *, r_min: float,
+          max_depth: int, order: str, deadline: float | None,
+          stats: PackStats | None = None):
+    """Generator behind :func:`pack_iter`: yields circles as they are emitted.
+
+    A gap is ``(c1, c2, c3, known, depth)`` - the body of ``pack``'s
+    ``recurse`` applied to one stack entry.  Stops early once ``deadline``
+    (a ``perf_counter`` value) has passed.
+    """
+    if order not in TRAVERSAL_ORDERS:
+        raise ValueError(f"order must be one of {TRAVERSAL_ORDERS} (got {order!r})")
+    breadth = order == "breadth"
+    dedup = SpatialDedup()
+    stack: list[tuple] = []
+    heap: list[tuple] = []          # (k_child, tiebreak, gap | None, emit | None)
+    tie = count()
+
+    def push(c1: Circle, c2: Circle, c3: Circle, known: Circle, depth: int):
+        if depth > max_depth:
+            if stats is not None:
+                stats.depth_cutoffs += 1
+            return
+        if not breadth:
+            stack.append((c1, c2, c3, known, depth))
+            return
+        k4 = 2.0 * (c1.k + c2.k + c3.k) - known.k
+        if k4 > 0 and 1.0 / k4 >= r_min:        # cheap pre-filter before heaping
+            heappush(heap, (k4, next(tie), (c1, c2, c3, known, depth), None))
+        elif stats is not None:                 # counted as visited right here
+            stats.enter(depth)
+            stats.rejected_r_min += k4 > 0
+
+    def visit(c1: Circle, c2: Circle, c3: Circle, known: Circle, depth: int):
+        """Process one gap; return the emitted circle (or ``None``)."""
+        if stats is not None:
+            stats.enter(depth)
+        child = soddy_reflect(known, c1, c2, c3)
+        if child.k <= 0:
+            return None
+        if child.r < r_min:
+            if stats is not None:
+                stats.rejected_r_min += 1
+            return None
+        inside = clip.contains_disk(child)
+        if not inside and not _touches(child, clip):
+            if stats is not None:
+                stats.rejected_clip += 1
+            return None
+        child = Circle(k=child.k, w=child.w, depth=depth, parent=-1)
+        if dedup.seen(child):
+            if stats is not None:
+                stats.dedup_hits += 1
+            return None
+        dedup.add(child)
+        # Pushed in reverse so the LIFO stack pops them in `pack`'s order.
+        push(c2, c3, child, c1, depth + 1)
+        push(c1, c3, child, c2, depth + 1)
+        push(c1, c2, child, c3, depth + 1)
+        return child if inside else None
+
+    def drain():
+        while stack or heap:
+            if deadline is not None and perf_counter() >= deadline:
+                return
+            if breadth:
+                _, _, gap, emit = heappop(heap)
+                if emit is not None:
+                    yield emit
+                    continue
+            else:
+                gap = stack.pop()
+            child = visit(*gap)
+            if child is not None:
+                yield child
+
+    for s in seeds:
+        if s.k > 0 and clip.contains_disk(s):
+            dedup.add(s)
+            if breadth:                 # seeds queue by size like everything else
+                heappush(heap, (s.k, next(tie), None, s))
+            else:
+                yield s
+
+    for a, b, c in tangent_triples([outer, *seeds]):
+        if deadline is not None and perf_counter() >= deadline:
+            return
+        if stats is not None:
+            stats.enter(1)
+        inner, _ = descartes_pair(a, b, c)
+        if inner.k <= 0:
+            continue
+        inner = Circle(k=inner.k, w=inner.w, depth=1)
+        if not dedup.seen(inner):
+            dedup.add(inner)
+            if inner.r >= r_min and clip.contains_disk(inner):
+                if breadth:
+                    heappush(heap, (inner.k, next(tie), None, inner))
+                else:
+                    yield inner
+        elif stats is not None:
+            stats.dedup_hits += 1
+        push(a, b, c, inner, 2)
+        push(b, c, inner, a, 2)
+        push(a, c, inner, b, 2)
+        push(a, b, inner, c, 2)
+        if not breadth:                 # depth-first: finish this triple first
+            yield from drain()
+    yield from drain()
+
+
+def tangent_pairs(members: list[Circle], tol: float = SEED_TANGENT_TOL
+                  ) -> np.ndarray:
+    """``(E, 2)`` index pairs ``i < j`` of members tangent within ``tol`` mm.
+
+    Same test as :func:`geometry.tangency_error`, but candidates come from a
+    k-d tree over the centres: two disks can only touch if their centres are
+    within ``r_i + r_j + tol``, so each small circle queries a ball of
+    ``r_i + r_small_max + tol``.  Only the few big circles (enclosing boundary,
+    giant frame seeds) and lines are paired with everyone.
+    """
+    n = len(members)
+    lines = [i for i, m in enumerate(members) if m.k == 0]
+    found = [np.array([(i, j) for i in lines for j in range(n) if i != j
+                       and tangency_error(members[i], members[j]) <= tol],
+                      np.int64).reshape(-1, 2)]
+    circ = np.array([i for i, m in enumerate(members) if m.k != 0], np.int64)
+    if len(circ) > 1:
+        found.append(circ[_circle_pairs([members[i] for i in circ], tol)])
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def _circle_pairs(members: list[Circle], tol: float) -> np.ndarray:
+    """:func:`tangent_pairs` among circles only (no ``k = 0`` members)."""
+    n = len(members)
+    z = np.array([m.z for m in members], complex)
+    r = np.array([m.r for m in members], float)
+    big = r > _CONTACT_BIG * np.median(r)
+    small = np.flatnonzero(~big)
+    cand = [np.zeros((0, 2), np.int64)]
+    if len(small) > 1:
+        xy = np.column_stack([z.real[small], z.imag[small]])
+        near = cKDTree(xy).query_ball_point(xy, r[small] + r[small].max() + tol)
+        i = np.repeat(np.arange(len(small)), [len(js) for js in near])
+        j = np.fromiter((j for js in near for j in js), np.int64, len(i))
+        cand.append(small[np.column_stack([i, j])])
+    for b in np.flatnonzero(big):
+        cand.append(np.column_stack([np.full(n, b), np.arange(n)]))
+    pairs = np.sort(np.concatenate(cand), axis=1)
+    pairs = np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0)
+    i, j = pairs[:, 0], pairs[:, 1]
+    d = np.abs(z[i] - z[j])
+    err = np.minimum(np.abs(d - (r[i] + r[j])), np.abs(d - np.abs(r[i] - r[j])))
+    return pairs[err <= tol]
+
+
+def tangent_triples(members: list[Circle]):
+    """Yield every mutually tangent triple (within ``SEED_TANGENT_TOL``) of
+    ``members`` - the gaps the recursion is seeded from.
+
+    Triangles (3-cliques) of the :func:`tangent_pairs` contact graph, so the
+    cost follows the number of actual contacts rather than ``C(n, 3)``.
+    Yielded in ``combinations(members, 3)`` order.
+    """
+    pairs = tangent_pairs(members)
+    adj: list[set[int]] = [set() for _ in members]
+    for i, j in pairs.tolist():
+        adj[i].add(j)
+        adj[j].add(i)
+    triples = sorted((i, j, k) for i, j in pairs.tolist()
+                     for k in adj[i] & adj[j] if k > j)
+    for i, j, k in triples:
+        yield members[i], members[j], members[k]
+
+
 def _touches(c: Circle, clip: Rect) -> bool:
     """Loose test: does the disk overlap the clip rect at all?"""
     z, r = c.z, c.r
@@ -171,4 +640,47 @@ if __name__ == "__main__":
     print("radii range:", min(c.r for c in circles), "..", max(c.r for c in circles))
     assert all(clip.contains_disk(c) for c in circles)
     assert any(abs(c.k - 3.0) < 1e-6 for c in circles), "missing the k=3 circles"
+
+    # Explicit-stack traversal: depth-first reproduces pack() exactly, breadth-
+    # first emits the same set largest-first, and a budget keeps the largest.
+    dfs = pack_stack([a, b], outer, clip, r_min=0.02, max_depth=20)
+    assert [(c.k, c.w) for c in dfs] == [(c.k, c.w) for c in circles]
+    mm = [Circle(k=c.k / 100, w=c.w, depth=c.depth) for c in (a, b)]
+    mm_outer = Circle(k=outer.k / 100, w=outer.w)
+    mm_clip = Rect(-100, -100, 100, 100)
+    ref = pack(mm, mm_outer, mm_clip, r_min=0.5)
+    bfs = pack_stack(mm, mm_outer, mm_clip, r_min=0.5, order="breadth")
+    assert len(bfs) == len(ref), (len(bfs), len(ref))
+    radii = [c.r for c in bfs]
+    assert radii == sorted(radii, reverse=True), "breadth order must shrink"
+    top = list(pack_iter(mm, mm_outer, mm_clip, r_min=0.5, max_circles=50))
+    assert [(c.k, c.w) for c in top] == [(c.k, c.w) for c in bfs[:50]]
+    assert not list(pack_iter(mm, mm_outer, mm_clip, max_seconds=0.0))
+    print(f"pack_iter: {len(bfs)} circles largest-first, budgets keep the largest")
+
+    # Recorded graph: same circles as pack(); every edge really is a tangency,
+    # and every gap's triple is mutually tangent.
+    got, g = pack_graph(mm, mm_outer, mm_clip, r_min=0.5)
+    assert [(c.k, c.w) for c in got] == [(c.k, c.w) for c in ref]
+    nodes = [Circle(k=k, w=w) for k, w in zip(g.k, g.w)]
+    assert all(tangency_error(nodes[i], nodes[j]) < 1e-6 for i, j in g.edges)
+    pairs = {tuple(e) for e in g.edges.tolist()}
+    for tri in np.sort(g.gaps, axis=1).tolist():
+        assert {(tri[0], tri[1]), (tri[1], tri[2]), (tri[0], tri[2])} <= pairs
+    indptr, nbrs = g.adjacency()
+    assert indptr[-1] == 2 * len(g.edges)
+    assert sorted(g.emitted[g.emitted >= 0].tolist()) == list(range(len(got)))
+    print(f"pack_graph: {len(g.k)} nodes, {len(g.edges)} tangencies, "
+          f"{len(g.gaps)} gaps ({int(np.sum(g.gap_child < 0))} leaves)")
+
+    # Contact-graph seeding finds exactly the brute-force tangent triples, in
+    # the same order, on a large "seed set" (a packing's own circles).
+    from itertools import combinations
+    many = [mm_outer, *ref[:120]]
+    brute = [t for t in combinations(range(len(many)), 3)
+             if all(tangency_error(many[i], many[j]) <= SEED_TANGENT_TOL
+                    for i, j in combinations(t, 2))]
+    index = {id(c): i for i, c in enumerate(many)}
+    assert [tuple(index[id(c)] for c in t) for t in tangent_triples(many)] == brute
+    print(f"tangent_triples: {len(brute)} triples among {len(many)} members")
     print("PACKING SMOKE TEST PASSED")
@@ -0,0 +1,158 @@
+"""Progressive background packing for the sketch's live preview.
+
+Dragging ``r_min`` / ``max_depth`` in the vsketch GUI used to block ``draw()``
+until the whole packing (and all its rendering) was done.  Here a background
+thread packs one generation at a time (:func:`arrays.pack_generations`) while
+``draw()`` renders whatever is ready:
+
+* :func:`request` starts a :class:`PackJob` for the current settings - or
+  returns the running / finished one if the settings did not change - and
+  cancels the previous job when they did (it stops at its next generation);
+* the sketch waits only for the first ``generations`` generations, draws those,
+  and each later redraw picks up the deeper generations finished meanwhile;
+* a finished job stores the full packing in :mod:`pack_cache` (under the
+  ``"vectorized"`` engine that produced it), so the export and every later
+  draw are served from the cache.
+
+vsketch has no hook for redrawing from another thread, so a redraw (Refresh,
+or any parameter change) is what picks up new generations.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import threading
+
+from arrays import CircleArrays, pack_generations
+from geometry import Circle
+from pack_cache import CACHE_DIR, cached, content_hash, snapped, store
+
+ENGINE = "vectorized"       # pack_cache key of the finished packing
+PREVIEW_GENERATIONS = 3     # generations a draw() waits for before drawing
+
+_JOB: PackJob | None = None     # the current job; replaced on a settings change
+
+
+class PackJob:
+    """One background packing of a seed file at fixed ``(r_min, max_depth)``."""
+
+    def __init__(self, path: str | pathlib.Path, *, r_min: float, max_depth: int,
+                 cache_dir: pathlib.Path = CACHE_DIR) -> None:
+        self.path, self.r_min, self.max_depth = path, float(r_min), int(max_depth)
+        self.cache_dir = cache_dir
+        self.key = (content_hash(path), self.r_min, self.max_depth)
+        self.cfg, self.seeds = snapped(path, cache_dir=cache_dir)
+        self._gens: list[CircleArrays] = []
+        self._cond = threading.Condition()
+        self._cancel = threading.Event()
+        self.done = False
+        self.error: BaseException | None = None
+        full = cached(path, r_min=r_min, max_depth=max_depth, engine=ENGINE,
+                      cache_dir=cache_dir)
+        if full is not None:
+            self._gens, self.done = [CircleArrays.from_circles(full)], True
+        else:
+            threading.Thread(target=self._run, daemon=True,
+                             name=f"pack {pathlib.Path(path).name}").start()
+
+    def _run(self) -> None:
+        cfg = self.cfg
+        try:
+            for gen in pack_generations([*self.seeds, *cfg.edge_lines()],
+                                        cfg.outer_circle(), cfg.clip,
+                                        r_min=self.r_min, max_depth=self.max_depth):
+                if self._cancel.is_set():
+                    return
+                with self._cond:
+                    self._gens.append(gen)
+                    self._cond.notify_all()
+            store(self.path, self.circles(), r_min=self.r_min,
+                  max_depth=self.max_depth, engine=ENGINE, cache_dir=self.cache_dir)
+        except Exception as exc:        # surfaced to draw() by wait()
+            self.error = exc
+        finally:
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Stop after the generation in flight; already-ready ones stay."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def generations(self) -> int:
+        return len(self._gens)
+
+    def wait(self, generations: int = PREVIEW_GENERATIONS,
+             timeout: float | None = None) -> bool:
+        """Block until ``generations`` are ready or the job ended; return
+        whether it has finished.  Re-raises a worker error."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.done or len(self._gens) >= generations,
+                                timeout)
+        if self.error is not None:
+            raise self.error
+        return self.done
+
+    def circles(self) -> list[Circle]:
+        """Every circle of the generations ready so far."""
+        with self._cond:
+            gens = list(self._gens)
+        return CircleArrays.concat(gens).to_circles()
+
+
+def request(path: str | pathlib.Path, *, r_min: float, max_depth: int,
+            cache_dir: pathlib.Path = CACHE_DIR) -> PackJob:
+    """The job for these settings: the current one if they match, else a new
+    one (the stale job is cancelled)."""
+    global _JOB
+    key = (content_hash(path), float(r_min), int(max_depth))
+    if _JOB is not None and _JOB.key == key and not _JOB.cancelled:
+        return _JOB
+    if _JOB is not None:
+        _JOB.cancel()
+    _JOB = PackJob(path, r_min=r_min, max_depth=max_depth, cache_dir=cache_dir)
+    return _JOB
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from engines import pack_with
+
+    src = pathlib.Path(__file__).resolve().parent / "seeds" / "irregular_frame.json"
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = pathlib.Path(tmp)
+        t0 = time.perf_counter()
+        stale = request(src, r_min=0.5, max_depth=40, cache_dir=store_dir)
+        job = request(src, r_min=0.3, max_depth=40, cache_dir=store_dir)
+        assert stale.cancelled and request(src, r_min=0.3, max_depth=40,
+                                           cache_dir=store_dir) is job
+        job.wait(PREVIEW_GENERATIONS)
+        first, n_first = job.circles(), job.generations
+        t1 = time.perf_counter()
+        job.wait(10 ** 6)
+        full = job.circles()
+        t2 = time.perf_counter()
+        print(f"first {n_first} generations: "
+              f"{len(first)} circles after {1e3 * (t1 - t0):.1f} ms; "
+              f"all {len(full)} after {1e3 * (t2 - t0):.1f} ms")
+        assert len(first) < len(full)
+
+        cfg = job.cfg
+        ref = pack_with(ENGINE, [*job.seeds, *cfg.edge_lines()], cfg.outer_circle(),
+                        cfg.clip, r_min=0.3, max_depth=40)
+        assert [(c.k, c.w) for c in full] == [(c.k, c.w) for c in ref]
+        # The finished packing is cached, so the next job is done at once.
+        hit = cached(src, r_min=0.3, max_depth=40, engine=ENGINE,
+                     cache_dir=store_dir)
+        assert hit is not None and len(hit) == len(full)
+        again = PackJob(src, r_min=0.3, max_depth=40, cache_dir=store_dir)
+        assert again.done and len(again.circles()) == len(full)
+        assert stale.wait() and stale.cancelled
+    print("PREVIEW SMOKE TEST PASSED")
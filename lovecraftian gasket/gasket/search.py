@@ -0,0 +1,723 @@
+"""CMA-ES arrangement search over ``search.free_ids`` (plan step 6).
+
+Moves the free seeds' ``(x, y, r)``, and scores each candidate by
+snap -> shallow pack (``max_gen_in_objective`` generations) -> ``analyse``.
+Each generation's population is evaluated on a process pool; candidate seeds
+are derived from ``(run seed, generation, index)`` so results do not depend on
+the worker count or scheduling.  Optimizer state is checkpointed every few
+generations so a long overnight run can be resumed, and the best configs are
+written to ``output/`` through :func:`config.dump` (the schema
+:func:`config.load` reads).
+
+CMA-ES (and restarts) revisit near-identical vectors, so evaluations go through
+an :class:`ObjectiveCache` keyed by the free parameters quantized to
+``--cache-quantum`` mm: LRU-bounded, optionally persisted with ``--cache-file``.
+
+With ``--surrogate-frac f < 1`` a :class:`Surrogate` (an RBF interpolant of
+``L`` over the free parameters, refit every generation on the true
+evaluations so far) pre-screens each population: only the ``f`` most
+promising candidates are snapped, packed and analysed; the rest are told to
+CMA-ES with their predicted value.
+
+The objective itself runs in stages (snap, first generation, shallow pack,
+per-gap terms) and stops as soon as a lower bound on ``L`` reaches the
+previous generation's worst survivor - most penalised candidates never get
+packed (``--no-early-abort`` disables this).  Selection stays exact: an
+aborted candidate that could still make this generation's survivors is
+evaluated in full (see :func:`settle_aborted`), and CMA-ES's active update,
+which would weigh the unselected tail by those bounds, is turned off.
+
+Run::
+
+    python search.py seeds/irregular_frame.json --gens 200 --workers 8
+    python search.py seeds/irregular_frame.json --gens 400 --resume
+    python search.py seeds/irregular_frame.json --gens 200 --surrogate-frac 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import cma
+import numpy as np
+from scipy.interpolate import RBFInterpolator
+
+from archive import ARCHIVE_PATH, ARCHIVE_QUANTUM, Archive
+from config import Config, dump, load
+from diagnostics import EYE_MAX, EYE_MIN, analyse, coherence_terms, gap_jumps
+from geometry import Circle, tangency_error
+from packing import pack_graph
+from snap import snap
+
+_HERE = Path(__file__).resolve().parent
+
+# Objective weights:  L = logr_spread + W_JUMP * gap_jump - W_EYES * n_eye_band
+#                         - W_SPREAD * eye_spatial_spread + penalties
+# (penalties: PENALTY per off-page seed and, with search.max_jump_ratio, per gap
+# whose child is more than that radius ratio away from a bounding circle)
+W_JUMP = 0.25          # per-gap coherence (q-quantile log-radius jump)
+W_EYES = 0.05          # reward per circle in the eye band
+W_SPREAD = 0.005       # reward per mm of eye-centre spread
+PENALTY = 1e3          # infeasible candidate (seed off the page, snap failure)
+ABORT_STAGES = ("snap", "gen1", "shallow")   # where evaluate() can stop early
+SEARCH_ENGINES = ("recursive",)  # engines that record the gap graph gap_jump needs
+
+CACHE_QUANTUM = 0.01   # objective-cache key resolution (mm)
+CACHE_SIZE = 100_000   # objective-cache entries kept (LRU)
+
+SURROGATE_MIN = 10         # true evaluations per free parameter before screening
+SURROGATE_POINTS = 400     # most recent true evaluations the RBF is fitted to
+SURROGATE_SMOOTHING = 1e-3
+
+
+@dataclass
+class Evaluation:
+    """One scored candidate."""
+
+    L: float
+    x: np.ndarray                   # the parameter vector that was asked for
+    seed: int
+    terms: dict = field(default_factory=dict)
+    residual: float = 0.0           # max post-snap tangency error (mm)
+    seconds: float = 0.0
+    circles: list = field(default_factory=list, repr=False)   # snapped seeds
+    aborted: str = ""               # stage the evaluation stopped early at
+
+
+# --------------------------------------------------------------------------- #
+# Parameter vector  <->  Config
+# --------------------------------------------------------------------------- #
+def free_space(cfg: Config) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(x0, lo, hi)`` for the free seeds' ``[x, y, r, ...]`` vector.
+
+    Centres are bounded by the clip, radii by ``search.bounds.r`` (default
+    ``[1, inf)``).
+    """
+    by_id = cfg.by_id()
+    r_lo, r_hi = cfg.search.get("bounds", {}).get("r", [1.0, np.inf])
+    x0, lo, hi = [], [], []
+    for sid in cfg.free_ids():
+        s = by_id[sid]
+        x0 += [s.z.real, s.z.imag, s.r]
+        lo += [cfg.clip.x0, cfg.clip.y0, r_lo]
+        hi += [cfg.clip.x1, cfg.clip.y1, r_hi]
+    return np.array(x0, float), np.array(lo, float), np.array(hi, float)
+
+
+def apply_vector(cfg: Config, x: np.ndarray) -> Config:
+    """A copy of ``cfg`` with the free seeds moved to ``x``."""
+    free = {sid: i for i, sid in enumerate(cfg.free_ids())}
+    seeds = []
+    for s in cfg.seeds:
+        if s.id in free:
+            i = 3 * free[s.id]
+            s = replace(s, z=complex(x[i], x[i + 1]), r=float(x[i + 2]))
+        seeds.append(s)
+    return replace(cfg, seeds=seeds)
+
+
+def candidate_seed(run_seed: int, gen: int, index: int) -> int:
+    """Deterministic per-candidate seed, independent of pool scheduling."""
+    return int(np.random.SeedSequence([run_seed, gen, index]).generate_state(1)[0])
+
+
+# --------------------------------------------------------------------------- #
+# Objective
+# --------------------------------------------------------------------------- #
+def objective(terms: dict) -> float:
+    return (terms["logr_spread"] + W_JUMP * terms.get("gap_jump", 0.0)
+            - W_EYES * terms["n_eye_band"]
+            - W_SPREAD * terms["eye_spatial_spread"])
+
+
+def reward_cap(cfg: Config, circles: list) -> float:
+    """Most the eye rewards can subtract from ``L`` given the snapped seeds.
+
+    Eye-band circles are disjoint disks of radius >= ``EYE_MIN``, so besides
+    the seeds at most ``free area / (pi EYE_MIN^2)`` of them fit in what the
+    seeds leave of the clip (and of the boundary circle); their centres lie
+    in the clip, so their spread is at most its half-diagonal.
+    """
+    c = cfg.clip
+    area = (c.x1 - c.x0) * (c.y1 - c.y0)
+    if cfg.boundary is not None:
+        area = min(area, np.pi * cfg.boundary.r ** 2)
+    inside = [s for s in circles if c.contains_disk(s)]
+    area -= sum(np.pi * s.r ** 2 for s in inside)
+    n_eye = sum(EYE_MIN <= s.r <= EYE_MAX for s in inside) \
+        + max(0, int(area / (np.pi * EYE_MIN ** 2)))
+    return W_EYES * n_eye + W_SPREAD * float(np.hypot(c.x1 - c.x0, c.y1 - c.y0)) / 2
+
+
+def evaluate(cfg: Config, x: np.ndarray, *, seed: int = 0,
+             engine: str = "recursive", jitter: float = 0.0,
+             bound: float = np.inf) -> Evaluation:
+    """Snap, shallow-pack and score one candidate, in stages.
+
+    ``jitter`` (mm) scores a perturbed copy drawn from the candidate's own
+    seed, so robustness to small moves is rewarded reproducibly.
+
+    Each stage ends with a lower bound on the final ``L``.  Once that reaches
+    ``bound`` (the previous generation's worst survivor) the candidate is
+    returned with the lower bound as its ``L`` and ``aborted`` naming the
+    stage; :func:`settle_aborted` decides afterwards whether it still needs
+    a full evaluation:
+
+    * ``snap`` - off-page seeds are penalised, and the eye rewards can
+      subtract at most :func:`reward_cap`;
+    * ``gen1`` - with ``search.max_jump_ratio`` every gap whose child is
+      over that radius ratio from a bounding circle costs ``PENALTY``.  The
+      first generation's gaps are gaps of the final packing, so their
+      penalties stand;
+    * ``shallow`` - after the ``max_gen_in_objective`` packing the size and
+      eye terms are exact, and ``gap_jump`` is non-negative.
+
+    The per-gap terms need the gap graph only :func:`packing.pack_graph`
+    records, so ``engine`` must be one of :data:`SEARCH_ENGINES`.
+    """
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"engine {engine!r} records no gap graph; the search "
+                         f"objective needs one of {SEARCH_ENGINES}")
+    t0 = time.perf_counter()
+    xe = np.asarray(x, float)
+    if jitter > 0:
+        xe = xe + np.random.default_rng(seed).normal(0.0, jitter, xe.shape)
+    cand = apply_vector(cfg, xe)
+    try:
+        circles = snap(cand)
+    except (ValueError, np.linalg.LinAlgError):
+        return Evaluation(L=PENALTY, x=x, seed=seed,
+                          seconds=time.perf_counter() - t0)
+
+    outer = cand.outer_circle()
+    by_id = cand.contacts(circles)
+    residual = max((tangency_error(by_id[a], by_id[b])
+                    for a, b in cand.tangencies), default=0.0)
+    off_page = sum(not cand.clip.contains_disk(c, slack=1e-6) for c in circles)
+    terms: dict = {}
+
+    def scored(L: float, aborted: str = "") -> Evaluation:
+        return Evaluation(L=float(L), x=x, seed=seed, terms=terms,
+                          residual=float(residual), circles=circles,
+                          seconds=time.perf_counter() - t0, aborted=aborted)
+
+    penalty, cap = PENALTY * off_page, reward_cap(cand, circles)
+    if penalty - cap >= bound:
+        return scored(penalty - cap, "snap")
+
+    max_depth = int(cand.search.get("max_gen_in_objective", 4))
+    members = [*circles, *cand.edge_lines()]
+    max_jump = cand.search.get("max_jump_ratio")
+    max_jump = np.log(float(max_jump)) if max_jump else None
+    if max_jump is not None and max_depth > 1:
+        _, gen1 = pack_graph(members, outer, cand.clip, r_min=cand.r_min, max_depth=1)
+        over = int((gap_jumps(gen1, cand.clip) > max_jump).sum())
+        if penalty + PENALTY * over - cap >= bound:
+            return scored(penalty + PENALTY * over - cap, "gen1")
+
+    packed, graph = pack_graph(members, outer, cand.clip, r_min=cand.r_min,
+                               max_depth=max_depth)
+    terms = analyse(cand, packed)
+    if max_jump is not None:
+        penalty += PENALTY * int((gap_jumps(graph, cand.clip) > max_jump).sum())
+    if objective(terms) + penalty >= bound:
+        return scored(objective(terms) + penalty, "shallow")
+    terms.update(coherence_terms(cand, graph))
+    return scored(objective(terms) + penalty)
+
+
+# Worker-process state: the config is loaded once per worker, not per job.
+_WORKER: dict = {}
+
+
+def _init_worker(path: str, engine: str, jitter: float) -> None:
+    _WORKER.update(cfg=load(path), engine=engine, jitter=jitter)
+
+
+def _evaluate_job(job: tuple[np.ndarray, int, float]) -> Evaluation:
+    x, seed, bound = job
+    return evaluate(_WORKER["cfg"], x, seed=seed, engine=_WORKER["engine"],
+                    jitter=_WORKER["jitter"], bound=bound)
+
+
+# --------------------------------------------------------------------------- #
+# Objective cache
+# --------------------------------------------------------------------------- #
+def quantize(x: np.ndarray, quantum: float, seed: int) -> tuple:
+    """``x`` on a ``quantum`` lattice, plus ``seed``: a hashable key."""
+    if not quantum > 0:
+        raise ValueError(f"quantize: quantum must be > 0, got {quantum}")
+    return (*np.round(np.asarray(x) / quantum).astype(np.int64).tolist(), seed)
+
+
+class ObjectiveCache:
+    """LRU map from quantized parameter vectors to :class:`Evaluation`.
+
+    Candidates are evaluated *at* their quantized point, so a hit returns
+    exactly what a fresh evaluation would.  ``context`` identifies what the
+    objective depends on besides ``x`` (config file contents, engine, jitter);
+    a persisted cache written under a different context is ignored.
+    ``quantum <= 0`` disables caching.
+    """
+
+    def __init__(self, context: str, *, quantum: float = CACHE_QUANTUM,
+                 maxsize: int = CACHE_SIZE, path: Path | None = None):
+        self.context, self.quantum, self.maxsize = context, quantum, maxsize
+        self.path = path
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        if path is not None and path.exists():
+            saved = pickle.loads(path.read_bytes())
+            if saved.get("context") == context and saved.get("quantum") == quantum:
+                self.entries = saved["entries"]
+                self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.quantum > 0 and self.maxsize > 0
+
+    def key(self, x: np.ndarray, seed: int) -> tuple:
+        """Quantized key; ``seed`` is part of it only when it affects the
+        objective (``jitter > 0``, folded in by the caller)."""
+        return quantize(x, self.quantum, seed)
+
+    def snap(self, x: np.ndarray) -> np.ndarray:
+        """``x`` moved onto the cache lattice (identity when disabled)."""
+        if not self.enabled:
+            return np.asarray(x, float)
+        return np.round(np.asarray(x) / self.quantum) * self.quantum
+
+    def get(self, key: tuple) -> Evaluation | None:
+        ev = self.entries.get(key)
+        if ev is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return ev
+
+    def put(self, key: tuple, ev: Evaluation) -> None:
+        if not self.enabled:
+            return
+        self.entries[key] = ev
+        self.entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def save(self) -> None:
+        if self.path is None or not self.enabled:
+            return
+        _save_checkpoint(self.path, {"context": self.context,
+                                     "quantum": self.quantum,
+                                     "entries": self.entries})
+
+    def summary(self) -> str:
+        n = self.hits + self.misses
+        rate = self.hits / n if n else 0.0
+        return (f"objective cache: {self.hits} hits / {self.misses} misses "
+                f"({rate:.1%} hit rate), {len(self.entries)} entries, "
+                f"{self.evictions} evicted")
+
+
+def evaluate_generation(X, seeds: list[int], cache: ObjectiveCache, jitter: float,
+                        pool: ProcessPoolExecutor | None,
+                        bound: float = np.inf) -> list[Evaluation]:
+    """Evaluate one population through ``cache``; duplicate keys within the
+    generation are evaluated once.  With the cache disabled every candidate
+    is evaluated as is.  Evaluations aborted against ``bound`` are not
+    cached - their ``L`` is only a bound."""
+    xs = [cache.snap(x) for x in X]
+    if cache.enabled:
+        keys = [cache.key(x, seed if jitter > 0 else 0) for x, seed in zip(xs, seeds)]
+    else:
+        keys = [(i,) for i in range(len(xs))]
+    results: list[Evaluation | None] = [None] * len(xs)
+    todo: dict[tuple, list[int]] = {}
+    for i, key in enumerate(keys):
+        if key in todo:                       # repeated within this generation
+            todo[key].append(i)
+            cache.hits += 1
+            continue
+        hit = cache.get(key) if cache.enabled else None
+        if hit is not None:
+            results[i] = replace(hit, x=xs[i], seed=seeds[i])
+        else:
+            todo[key] = [i]
+    jobs = [(xs[ids[0]], seeds[ids[0]], bound) for ids in todo.values()]
+    fresh = pool.map(_evaluate_job, jobs) if pool else map(_evaluate_job, jobs)
+    for (key, ids), ev in zip(todo.items(), fresh):
+        if not ev.aborted:
+            cache.put(key, ev)
+        for i in ids:
+            results[i] = replace(ev, x=xs[i], seed=seeds[i])
+    return results
+
+
+def settle_aborted(results: list[Evaluation], mu: int, cache: ObjectiveCache,
+                   jitter: float, pool: ProcessPoolExecutor | None) -> list[Evaluation]:
+    """Re-evaluate the aborted candidates that could still be selected.
+
+    The abort bound is the *previous* generation's ``mu``-th value; with
+    comma selection this generation's can be worse, so a candidate whose
+    lower bound is below this generation's ``mu``-th complete ``L`` is
+    evaluated in full.  The ones left aborted rank behind at least ``mu``
+    complete evaluations either way."""
+    done = sorted(r.L for r in results if not r.aborted)
+    cut = done[mu - 1] if len(done) >= mu else np.inf
+    redo = [i for i, r in enumerate(results) if r.aborted and r.L < cut]
+    if not redo:
+        return results
+    again = evaluate_generation([results[i].x for i in redo],
+                                [results[i].seed for i in redo], cache, jitter, pool)
+    results = list(results)
+    for i, ev in zip(redo, again):
+        results[i] = ev
+    return results
+
+
+def rank_aborted(fitness: list[float], aborted: np.ndarray) -> list[float]:
+    """``fitness`` with the aborted candidates' lower bounds moved behind
+    every complete value, in the same order, so CMA-ES never ranks an
+    aborted candidate ahead of one it has a true ``L`` for."""
+    fitness = np.asarray(fitness, float)
+    if aborted.any() and not aborted.all():
+        worst, low = fitness[~aborted].max(), fitness[aborted].min()
+        fitness[aborted] += max(0.0, np.nextafter(worst, np.inf) - low)
+    return fitness.tolist()
+
+
+# --------------------------------------------------------------------------- #
+# Surrogate pre-screening
+# --------------------------------------------------------------------------- #
+class Surrogate:
+    """Thin-plate RBF model of ``L`` over the free parameters.
+
+    Fitted to the most recent ``max_points`` feasible true evaluations (a
+    penalised candidate would put a 1e3 cliff into the interpolant), with each
+    coordinate scaled by its spread in the archive so millimetres of centre
+    and of radius weigh alike.  Until ``min_points`` per parameter are in, it
+    screens nothing: a model fitted to the first couple of generations steers
+    CMA-ES into whichever basin it happens to favour.
+    """
+
+    def __init__(self, frac: float, *, min_points: int = SURROGATE_MIN,
+                 max_points: int = SURROGATE_POINTS):
+        self.frac, self.min_points, self.max_points = frac, min_points, max_points
+        self.X: list[np.ndarray] = []
+        self.y: list[float] = []
+        self.model: RBFInterpolator | None = None
+        self.scale: np.ndarray | None = None
+        self.true = self.screened = 0
+        self.true_seconds = self.fit_seconds = 0.0
+
+    def add(self, results: list[Evaluation]) -> None:
+        """Record true evaluations and refit."""
+        self.true += len(results)
+        self.true_seconds += sum(ev.seconds for ev in results)
+        for ev in results:
+            if ev.L < PENALTY and not ev.aborted:   # infeasible: kept out
+                self.X.append(np.asarray(ev.x, float))
+                self.y.append(ev.L)
+        del self.X[:-self.max_points], self.y[:-self.max_points]
+        self.fit()
+
+    def fit(self) -> None:
+        t0 = time.perf_counter()
+        self.model = None
+        if self.y and len(self.y) >= self.min_points * len(self.X[0]):
+            X = np.array(self.X)
+            self.scale = np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+            try:
+                self.model = RBFInterpolator(X / self.scale, np.array(self.y),
+                                             kernel="thin_plate_spline",
+                                             smoothing=SURROGATE_SMOOTHING)
+            except (ValueError, np.linalg.LinAlgError):
+                pass                        # degenerate archive: screen nothing
+        self.fit_seconds += time.perf_counter() - t0
+
+    def screen(self, X) -> tuple[np.ndarray, np.ndarray | None]:
+        """``(indices to evaluate truly, predictions)``; all of them (and no
+        predictions) while the model is not ready."""
+        if self.model is None:
+            return np.arange(len(X)), None
+        t0 = time.perf_counter()
+        pred = self.model(np.asarray(X, float) / self.scale)
+        self.fit_seconds += time.perf_counter() - t0
+        n = max(1, int(np.ceil(self.frac * len(X))))
+        return np.sort(np.argsort(pred, kind="stable")[:n]), pred
+
+    def fitness(self, n: int, keep: np.ndarray, results: list[Evaluation],
+                pred: np.ndarray | None) -> list[float]:
+        """Values to tell CMA-ES: true ``L`` where evaluated, the prediction
+        elsewhere.  (Pinning the screened candidates behind the worst true
+        value instead biases selection enough to collapse the step size.)"""
+        L = np.empty(n)
+        L[keep] = [ev.L for ev in results]
+        rest = np.setdiff1d(np.arange(n), keep)
+        if len(rest):
+            L[rest] = pred[rest]
+        self.screened += len(rest)
+        return L.tolist()
+
+    def summary(self) -> str:
+        n = self.true + self.screened
+        ratio = self.true / n if n else 1.0
+        mean = self.true_seconds / self.true if self.true else 0.0
+        return (f"surrogate: {self.true} true / {self.screened} screened "
+                f"evaluations ({ratio:.1%} true), ~{self.screened * mean:.1f} s "
+                f"of evaluation skipped for {self.fit_seconds:.2f} s of fitting")
+
+
+# --------------------------------------------------------------------------- #
+# Runner
+# --------------------------------------------------------------------------- #
+def _save_checkpoint(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(pickle.dumps(state))
+    os.replace(tmp, path)                   # atomic: never a torn checkpoint
+
+
+def _from_row(cfg: Config, row: dict) -> Evaluation:
+    """An :class:`Evaluation` back from an archive row."""
+    circles = [Circle.from_center(complex(x, y), r, feature=s.feature)
+               for (x, y, r), s in zip(row["circles"], cfg.seeds)]
+    return Evaluation(L=row["L"], x=np.array(row["x"]), seed=row["seed"],
+                      terms=row["terms"], residual=row["residual"],
+                      seconds=row["seconds"], circles=circles)
+
+
+def write_top(cfg: Config, top: list[Evaluation], out_dir: Path,
+              stem: str) -> list[Path]:
+    """Write the best configs (snapped seeds) as ``<stem>_top<i>.json``."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, ev in enumerate(top, 1):
+        best = apply_vector(cfg, ev.x)
+        best = replace(best, seeds=[replace(s, z=c.z, r=c.r)
+                                    for s, c in zip(best.seeds, ev.circles)])
+        path = out_dir / f"{stem}_top{i}.json"
+        dump(best, path, extra={"_search": {
+            "objective": ev.L, "seed": ev.seed, "residual": ev.residual,
+            "terms": {k: v for k, v in ev.terms.items() if k != "gens"}}})
+        paths.append(path)
+    return paths
+
+
+def run(path: str | Path, *, gens: int = 100, popsize: int | None = None,
+        sigma0: float = 4.0, workers: int | None = None, seed: int = 1,
+        engine: str = "recursive", jitter: float = 0.0, top_k: int = 3,
+        checkpoint: Path | None = None, checkpoint_every: int = 5,
+        resume: bool = False, out_dir: Path | None = None,
+        cache_quantum: float = CACHE_QUANTUM, cache_size: int = CACHE_SIZE,
+        cache_file: Path | None = None,
+        surrogate_frac: float = 1.0, early_abort: bool = True,
+        archive: Path | None = ARCHIVE_PATH,
+        warm_start: bool = False) -> list[Evaluation]:
+    """Run (or resume) the search and return the ``top_k`` evaluations.
+
+    ``surrogate_frac < 1`` evaluates only that fraction of each population
+    for real, chosen by a :class:`Surrogate` (kept in the checkpoint).  With
+    ``early_abort`` each candidate is scored against the previous
+    generation's worst survivor (its ``mu``-th best), see :func:`evaluate`
+    and :func:`settle_aborted`; CMA-ES then runs without its active
+    covariance update, which would rank the unselected tail by the abort
+    bounds instead of the true values.
+    Complete evaluations are appended to the :class:`archive.Archive` at
+    ``archive``, whose rows for the same context also preload the objective
+    cache; ``warm_start`` centres a fresh run on the best archived point."""
+    path = Path(path)
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"engine {engine!r} records no gap graph; the search "
+                         f"objective needs one of {SEARCH_ENGINES}")
+    cfg = load(path)
+    if not cfg.free_ids():
+        raise ValueError(f"{path.name}: search.free_ids is empty - nothing to move")
+    workers = workers or os.cpu_count() or 1
+    checkpoint = checkpoint or _HERE / "output" / f"{path.stem}.search.pkl"
+    out_dir = out_dir or _HERE / "output"
+
+    context = hashlib.sha256(path.read_bytes()
+                             + f"|{engine}|{jitter!r}|{W_JUMP, W_EYES, W_SPREAD}".encode()
+                             ).hexdigest()
+    store = Archive(archive) if archive is not None else None
+    # Archive rows are keyed on the cache lattice (or a fine one if it is off).
+    quantum = cache_quantum if cache_quantum > 0 else ARCHIVE_QUANTUM
+
+    if resume and checkpoint.exists():
+        state = pickle.loads(checkpoint.read_bytes())
+        print(f"resuming from {checkpoint} at generation {state['gen']}")
+    else:
+        x0, lo, hi = free_space(cfg)
+        best = store.best(context, limit=top_k) if store and warm_start else []
+        if best:
+            x0 = np.clip(best[0]["x"], lo, hi)
+            print(f"warm start from the archived best, L = {best[0]['L']:.4f}")
+        opts = {"bounds": [lo.tolist(), hi.tolist()], "seed": seed, "verbose": -9}
+        if popsize:
+            opts["popsize"] = popsize
+        if early_abort:
+            opts["CMA_active"] = False
+        state = {"es": cma.CMAEvolutionStrategy(x0, sigma0, opts), "gen": 0,
+                 "top": [_from_row(cfg, row) for row in best], "evals": 0,
+                 "seed": seed}
+    es = state["es"]
+    if early_abort and min(es.sp.weights) < 0:
+        print("early abort off: this run was started with CMA-ES's active update")
+        early_abort = False
+    surrogate = None
+    if surrogate_frac < 1:
+        surrogate = state.get("surrogate") or Surrogate(surrogate_frac)
+        surrogate.frac = surrogate_frac
+        state["surrogate"] = surrogate
+    cache = ObjectiveCache(context, quantum=cache_quantum, maxsize=cache_size,
+                           path=cache_file)
+    if cache.entries:
+        print(f"loaded {len(cache.entries)} cached evaluations from {cache_file}")
+    if store is not None and cache.enabled:
+        rows = store.load(context, quantum, limit=cache.maxsize)
+        for row in rows:
+            cache.put(row["key"], _from_row(cfg, row))
+        if rows:
+            print(f"loaded {len(rows)} archived evaluations from {archive}")
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                               initargs=(str(path), engine, jitter)) \
+        if workers > 1 else None
+    if pool is None:
+        _init_worker(str(path), engine, jitter)
+    t_run = time.perf_counter()
+    evals_run = 0
+    aborts: Counter = Counter()
+    try:
+        while state["gen"] < gens and not es.stop():
+            gen = state["gen"]
+            X = es.ask()
+            seeds = [candidate_seed(state["seed"], gen, i) for i in range(len(X))]
+            t0 = time.perf_counter()
+            hits = cache.hits
+            bound = state.get("bound", np.inf) if early_abort else np.inf
+            keep, pred = surrogate.screen(X) if surrogate else (range(len(X)), None)
+            results = evaluate_generation([X[i] for i in keep],
+                                          [seeds[i] for i in keep],
+                                          cache, jitter, pool, bound)
+            if early_abort:
+                results = settle_aborted(results, es.sp.weights.mu, cache, jitter, pool)
+            dt = time.perf_counter() - t0
+            if surrogate is not None:
+                fitness = surrogate.fitness(len(X), keep, results, pred)
+                surrogate.add(results)
+            else:
+                fitness = [r.L for r in results]
+            flags = np.zeros(len(X), bool)
+            flags[keep] = [bool(r.aborted) for r in results]
+            fitness = rank_aborted(fitness, flags)
+            es.tell(X, fitness)
+            state["bound"] = sorted(fitness)[es.sp.weights.mu - 1]
+            aborted = [r.aborted for r in results if r.aborted]
+            aborts.update(aborted)
+            if store is not None:
+                store.add(context, quantum, path.name, state["seed"],
+                          [(quantize(r.x, quantum, r.seed if jitter > 0 else 0), r)
+                           for r in results if not r.aborted])
+
+            state["top"] = sorted(state["top"] + [r for r in results if not r.aborted],
+                                  key=lambda r: r.L)[:top_k]
+            state["evals"] += len(results)
+            state["gen"] = gen + 1
+            evals_run += len(results)
+            print(f"gen {gen:4d}  best L = {state['top'][0].L:8.4f}  "
+                  f"gen best = {min(r.L for r in results):8.4f}  "
+                  f"{len(results) / dt / workers:7.1f} evals/s/core  "
+                  f"{cache.hits - hits:3d} cached"
+                  + (f"  {len(aborted):3d} aborted" if early_abort else "")
+                  + (f"  {len(X) - len(results):3d} screened" if surrogate else ""))
+            if state["gen"] % checkpoint_every == 0:
+                _save_checkpoint(checkpoint, state)
+                cache.save()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if store is not None:
+            store.close()
+
+    _save_checkpoint(checkpoint, state)
+    cache.save()
+    wall = time.perf_counter() - t_run
+    if evals_run:
+        print(f"\n{evals_run} evaluations in {wall:.1f} s on {workers} worker(s): "
+              f"{evals_run / wall / workers:.1f} evals/s/core "
+              f"({state['evals']} total incl. resumed)")
+    print(cache.summary())
+    if early_abort and evals_run:
+        print(f"early abort: {sum(aborts.values())} of {evals_run} evaluations ("
+              + ", ".join(f"{aborts[s]} after {s}" for s in ABORT_STAGES) + ")")
+    if surrogate is not None:
+        print(surrogate.summary())
+    if store is not None:
+        print(f"archive: {store.added} new evaluations in {archive}")
+    for p in write_top(cfg, state["top"], out_dir, path.stem):
+        print(f"wrote {p}")
+    return state["top"]
+
+
+def main(argv):
+    ap = argparse.ArgumentParser(prog=argv[0], description=__doc__.split("\n")[0])
+    ap.add_argument("path")
+    ap.add_argument("--gens", type=int, default=100)
+    ap.add_argument("--popsize", type=int, default=None)
+    ap.add_argument("--sigma", type=float, default=4.0, help="initial step (mm)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--engine", choices=SEARCH_ENGINES, default="recursive")
+    ap.add_argument("--jitter", type=float, default=0.0,
+                    help="score a seeded perturbation of each candidate (mm)")
+    ap.add_argument("--top-k", type=int, default=3)
+    ap.add_argument("--checkpoint", type=Path, default=None)
+    ap.add_argument("--checkpoint-every", type=int, default=5)
+    ap.add_argument("--resume", action="store_true")
+    ap.add_argument("--out", type=Path, default=None,
+                    help="top-k output dir (default output/)")
+    ap.add_argument("--cache-quantum", type=float, default=CACHE_QUANTUM,
+                    help="objective-cache key resolution in mm (0 disables)")
+    ap.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    ap.add_argument("--cache-file", type=Path, default=None,
+                    help="persist the objective cache across runs")
+    ap.add_argument("--no-early-abort", dest="early_abort", action="store_false",
+                    help="always run every objective stage")
+    ap.add_argument("--archive", type=Path, default=ARCHIVE_PATH,
+                    help="SQLite archive of every evaluation (see archive.py)")
+    ap.add_argument("--no-archive", dest="archive", action="store_const", const=None)
+    ap.add_argument("--warm-start", action="store_true",
+                    help="start from the best archived point for this seed file")
+    ap.add_argument("--surrogate-frac", type=float, default=1.0,
+                    help="fraction of each population evaluated for real, "
+                         "picked by an RBF surrogate (1 disables)")
+    a = ap.parse_args(argv[1:])
+    run(a.path, gens=a.gens, popsize=a.popsize, sigma0=a.sigma,
+        workers=a.workers, seed=a.seed, engine=a.engine, jitter=a.jitter,
+        top_k=a.top_k, checkpoint=a.checkpoint,
+        checkpoint_every=a.checkpoint_every, resume=a.resume, out_dir=a.out,
+        cache_quantum=a.cache_quantum, cache_size=a.cache_size,
+        cache_file=a.cache_file, surrogate_frac=a.surrogate_frac,
+        early_abort=a.early_abort, archive=a.archive, warm_start=a.warm_start)
+
+
+if __name__ == "__main__":
+    # Run the importable module, so checkpoints and cache files pickle
+    # search.Evaluation rather than __main__.Evaluation.
+    import search
+    search.main(sys.argv)
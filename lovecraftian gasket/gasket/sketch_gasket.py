@@ -19,11 +19,13 @@ sys.path.insert(0, str(_HERE))
 _REPO = _HERE.parents[1]
 sys.path.insert(0, str(_REPO))
 
-from config import load                                    # noqa: E402
+from engines import PACK_ENGINES                           # noqa: E402
 from features import render_circle                         # noqa: E402
-from packing import pack                                   # noqa: E402
-from penfill import install_swatches, load_pens            # noqa: E402
-from snap import snap                                      # noqa: E402
+from pack_cache import packed, snapped                     # noqa: E402
+from packing import pack_iter                              # noqa: E402
+from penfill import draw_geometry, install_swatches, load_pens  # noqa: E402
+from preview import request as request_packing             # noqa: E402
+from render import render_geometries                       # noqa: E402
 from style import FRAME_STYLES, OFFSET_MODES, SHADING_MODES, Style  # noqa: E402
 
 PENS = load_pens(_REPO / "pens")
@@ -31,6 +33,8 @@ PEN_NAMES = list(PENS)
 COLOR_CHOICES = ["none"] + PEN_NAMES
 install_swatches(PENS)
 
+_PX_PER_MM = 96 / 25.4         # pen_width arrives in px (unit="mm")
+
 SEED_FILES = sorted(p.name for p in (_HERE / "seeds").glob("*.json"))
 
 
@@ -44,11 +48,30 @@ class GasketSketch(vsketch.SketchClass):
     # must NOT use unit="mm" or they arrive ~3.78x too large.  Only pen_width keeps
     # unit="mm" because vsk.penWidth() genuinely wants pixels.
     pen_width = vsketch.Param(0.3, min_value=0.01, decimals=2, unit="mm")
+    # Level of detail: curves are tessellated to this chord error (mm) and
+    # details narrower than pen_width are dropped (see features.py).
+    chord_tol = vsketch.Param(0.05, min_value=0.005, decimals=3)
     snap_seed = vsketch.Param(0)            # vsk.randomSeed for stipple/orifice jitter
+    # 0 = draw each circle straight into vsketch (one shared random stream);
+    # N >= 1 = render per-circle Geometry on N processes, each circle seeded
+    # from (snap_seed, index) - identical output for any N.
+    render_workers = vsketch.Param(0, min_value=0)
 
     # --- packing
     r_min = vsketch.Param(2.0, min_value=0.5, decimals=2)   # mm
     max_depth = vsketch.Param(40, min_value=1)
+    engine = vsketch.Param("recursive", choices=PACK_ENGINES)
+    # Preview budgets (0 = off).  When either is set the packing is streamed
+    # largest-first (packing.pack_iter) and each circle is rendered as it
+    # arrives; the budget only ever drops the smallest circles.
+    max_circles = vsketch.Param(0, min_value=0)
+    max_seconds = vsketch.Param(0.0, min_value=0.0, decimals=1)
+    # Progressive preview: pack generation by generation in the background
+    # (preview.py, vectorized engine), draw once preview_generations are ready;
+    # each redraw (Refresh) adds the deeper ones finished meanwhile.  Changing
+    # r_min / max_depth cancels the stale job; the finished packing is cached.
+    progressive = vsketch.Param(False)
+    preview_generations = vsketch.Param(3, min_value=1)
 
     # --- the coherent-series axis + frame
     shading_mode = vsketch.Param("hatch", choices=SHADING_MODES)
@@ -130,13 +153,15 @@ class GasketSketch(vsketch.SketchClass):
             orifice_cross_hatch=bool(self.orifice_cross_hatch),
             stroke_layer=1, fill_layer=2,
             frame_style=self.frame_style,
+            pen_width=self.pen_width / _PX_PER_MM, chord_tol=self.chord_tol,
         )
 
     def _draw_frame(self, vsk, cfg, style) -> None:
         if style.frame_style in ("none",):
             return
         vsk.stroke(style.stroke_layer)
-        if style.frame_style in ("circle", "circle+rect"):
+        if style.frame_style in ("circle", "circle+rect") \
+                and cfg.boundary is not None:
             o = cfg.outer_circle()
             vsk.circle(o.z.real, o.z.imag, radius=o.r)
         if style.frame_style in ("rect", "circle+rect"):
@@ -150,15 +175,36 @@ class GasketSketch(vsketch.SketchClass):
         if self.snap_seed:
             vsk.randomSeed(self.snap_seed)
 
-        cfg = load(_HERE / "seeds" / self.seed_file)
-        seeds = snap(cfg)
-        outer = cfg.outer_circle()
-        circles = pack(seeds, outer, cfg.clip,
-                       r_min=self.r_min, max_depth=int(self.max_depth))
+        # Snap + pack are cached on the seed file's content (pack_cache), so
+        # style-only tweaks go straight to rendering.
+        path = _HERE / "seeds" / self.seed_file
+        if self.progressive:
+            job = request_packing(path, r_min=self.r_min,
+                                  max_depth=int(self.max_depth))
+            job.wait(int(self.preview_generations))
+            cfg, circles = job.cfg, job.circles()
+        elif self.max_circles or self.max_seconds:
+            cfg, seeds = snapped(path)
+            circles = pack_iter([*seeds, *cfg.edge_lines()],
+                                cfg.outer_circle(), cfg.clip,
+                                r_min=self.r_min, max_depth=int(self.max_depth),
+                                max_circles=int(self.max_circles) or None,
+                                max_seconds=self.max_seconds or None)
+        else:
+            cfg, seeds, circles = packed(path, r_min=self.r_min,
+                                         max_depth=int(self.max_depth),
+                                         engine=self.engine)
 
         style = self._style()
-        for c in circles:
-            render_circle(vsk, c, style)
+        if self.render_workers:
+            # snap_seed 0 varies each run here too: draw the base seed from vsk.
+            seed = int(self.snap_seed) or int(vsk.random(0, 2 ** 31))
+            geoms = render_geometries(circles, style, seed=seed,
+                                      workers=int(self.render_workers))
+            draw_geometry(vsk, [prim for g in geoms for prim in g])
+        else:
+            for c in circles:
+                render_circle(vsk, c, style)
         self._draw_frame(vsk, cfg, style)
 
         # Layer colours (mirrors the boxes sketch convention).
@@ -72,6 +72,10 @@ class Style:
     stroke_layer: int = 1        # line work (sclera, iris, teeth, rings)
     fill_layer: int = 2          # dark shading (pupil, orifice interior, tissue)
 
+    # --- level of detail (mm): curve tessellation + sub-pen-width culling
+    pen_width: float = 0.3       # nib width; finer detail is dropped / clamped
+    chord_tol: float = 0.05      # max distance of a tessellated curve from the arc
+
     # --- frame
     frame_style: str = "circle"  # none | circle | rect | circle+rect
 